@@ -0,0 +1,299 @@
+"""
+Load and latency benchmark of the API, driven in-process.
+
+A throwaway database is seeded through `benchmarks.seed`, the real app from `src.app.init()`
+is served by httpx's ASGI transport with its session dependency bound to that database, and
+every endpoint below is hit `--requests` times by `--concurrency` concurrent clients. The
+p50/p95/p99 latency and the throughput of each endpoint are compared with a JSON baseline:
+the run fails when a tracked endpoint's p95 grows, or its throughput drops, by more than
+`--threshold`. A missing baseline file, or `--update-baseline`, records the run instead.
+
+    python -m benchmarks.load --users 10 --transactions-per-user 1000 --concurrency 16
+    python -m benchmarks.load --update-baseline
+
+The configured Postgres database gets a throwaway schema. To run without any database
+server, point `--database-url` at an embedded SQLite file (needs `aiosqlite`):
+
+    python -m benchmarks.load --database-url sqlite+aiosqlite:///benchmark.db
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncGenerator, Callable
+
+import httpx
+from sqlalchemy import text, true
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import src.budget_usage as budget_usage
+import src.daily_balance as daily_balance
+import src.db as db
+from benchmarks.seed import SeededUser, SeedSpec, seed
+from src.app import init
+from src.auth import auth
+from src.config import cfg
+from src.schemas.budgets import Budget
+from src.schemas.goals import Goal
+from src.schemas.transactions import Transaction
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+@dataclass
+class Fixture:
+    users: list[SeededUser]
+    transaction_ids: list[int]
+    budget_ids: list[int]
+    goal_ids: list[int]
+
+
+@dataclass
+class Request:
+    method: str
+    url: str
+    body: dict | None = None
+
+
+@dataclass
+class Endpoint:
+    name: str
+    build: Callable[[Fixture, SeededUser, random.Random], Request]
+
+
+@dataclass
+class Result:
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput_rps: float
+
+
+def new_transaction(user: SeededUser, rnd: random.Random) -> dict:
+    return {
+        "user_id": user.id,
+        "category_id": rnd.choice(user.category_ids),
+        "amount": str(rnd.randint(100, 50000) / 100),
+        "date": (datetime.utcnow() - timedelta(days=rnd.randint(0, 365))).isoformat(),
+        "description": "benchmark",
+        "tag_ids": rnd.sample(user.tag_ids, min(2, len(user.tag_ids))),
+    }
+
+
+ENDPOINTS = [
+    Endpoint("transactions: list", lambda f, u, r: Request("GET", f"/transactions/?user_id={u.id}")),
+    Endpoint("transactions: get", lambda f, u, r: Request("GET", f"/transactions/{r.choice(f.transaction_ids)}")),
+    Endpoint(
+        "transactions: with tags",
+        lambda f, u, r: Request("GET", f"/transactions/{r.choice(f.transaction_ids)}/with-tags"),
+    ),
+    Endpoint("transactions: create", lambda f, u, r: Request("POST", "/transactions/", new_transaction(u, r))),
+    Endpoint("budgets: list", lambda f, u, r: Request("GET", f"/budgets/?user_id={u.id}")),
+    Endpoint("budgets: status", lambda f, u, r: Request("GET", f"/budgets/{r.choice(f.budget_ids)}/status")),
+    Endpoint("goals: list", lambda f, u, r: Request("GET", f"/goals/?user_id={u.id}")),
+    Endpoint("goals: forecast", lambda f, u, r: Request("GET", f"/goals/forecast?user_id={u.id}")),
+    Endpoint("categories: list", lambda f, u, r: Request("GET", f"/categories/?user_id={u.id}")),
+    Endpoint("tags: list", lambda f, u, r: Request("GET", f"/tags/?user_id={u.id}")),
+    Endpoint(
+        "analytics: spending",
+        lambda f, u, r: Request("GET", f"/analytics/spending?user_id={u.id}&group_by=category&period=month"),
+    ),
+    Endpoint(
+        "analytics: balance",
+        lambda f, u, r: Request("GET", f"/analytics/balance?user_id={u.id}&granularity=month"),
+    ),
+    Endpoint(
+        "search: transactions",
+        lambda f, u, r: Request("GET", f"/search/transactions?q={r.choice(['coffee', 'rent', 'tax'])}&user_id={u.id}"),
+    ),
+]
+
+
+def benchmark_engine(url: str | None, schema: str, pool_size: int) -> AsyncEngine:
+    if url is not None:
+        return create_async_engine(url)
+    return create_async_engine(
+        cfg.db.async_url,
+        pool_size=pool_size,
+        max_overflow=0,
+        # see `benchmarks/query_plans.py` on keeping `public` on the path
+        connect_args={"server_settings": {"search_path": f"{schema}, public"}},
+    )
+
+
+async def prepare(engine: AsyncEngine, schema: str | None, spec: SeedSpec) -> Fixture:
+    async with engine.begin() as conn:
+        if schema is not None:
+            await conn.execute(text(f"CREATE SCHEMA {schema}"))
+            await conn.run_sync(SQLModel.metadata.create_all, checkfirst=False)
+        else:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        users = await seed(conn, spec)
+
+    async with AsyncSession(engine) as session:
+        # seeding bypasses the routers, so the counters they maintain are built in one pass
+        await budget_usage.recompute(session, true())
+        await daily_balance.recompute(session, true())
+        await session.commit()
+
+        return Fixture(
+            users=users,
+            transaction_ids=list((await session.exec(select(Transaction.id))).all()),
+            budget_ids=list((await session.exec(select(Budget.id))).all()),
+            goal_ids=list((await session.exec(select(Goal.id))).all()),
+        )
+
+
+async def teardown(engine: AsyncEngine, schema: str | None) -> None:
+    async with engine.begin() as conn:
+        if schema is not None:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        else:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+    await engine.dispose()
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    endpoint: Endpoint,
+    fixture: Fixture,
+    tokens: dict[int, str],
+    requests: int,
+    concurrency: int,
+    rnd: random.Random,
+) -> Result:
+    latencies, errors = [], 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            user = rnd.choice(fixture.users)
+            request = endpoint.build(fixture, user, rnd)
+            headers = {"Authorization": f"Bearer {tokens[user.id]}"}
+
+            started = time.perf_counter()
+            response = await client.request(request.method, request.url, json=request.body, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            errors += response.status_code >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return Result(
+        requests=requests,
+        errors=errors,
+        p50_ms=round(cuts[49] * 1000, 2),
+        p95_ms=round(cuts[94] * 1000, 2),
+        p99_ms=round(cuts[98] * 1000, 2),
+        throughput_rps=round(requests / elapsed, 1),
+    )
+
+
+async def run(args: argparse.Namespace) -> dict[str, Result]:
+    schema = None if args.database_url else f"load_{os.getpid()}"
+    engine = benchmark_engine(args.database_url, schema, args.concurrency)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def benchmark_session() -> AsyncGenerator[AsyncSession, None]:
+        async with session_factory() as session:
+            yield session
+
+    app = init()
+    app.dependency_overrides[db.get_session] = benchmark_session
+
+    spec = SeedSpec(users=args.users, transactions_per_user=args.transactions_per_user, seed=args.seed)
+    rnd = random.Random(args.seed)
+    results = {}
+    try:
+        fixture = await prepare(engine, schema, spec)
+        tokens = {user.id: auth.encode_token(user.email) for user in fixture.users}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for endpoint in ENDPOINTS:
+                if args.only and not any(name in endpoint.name for name in args.only):
+                    continue
+                await drive(client, endpoint, fixture, tokens, args.warmup, min(args.warmup, args.concurrency), rnd)
+                results[endpoint.name] = await drive(
+                    client, endpoint, fixture, tokens, args.requests, args.concurrency, rnd
+                )
+                result = results[endpoint.name]
+                print(
+                    f"{endpoint.name:<26} p50 {result.p50_ms:>8.2f} ms  p95 {result.p95_ms:>8.2f} ms  "
+                    f"p99 {result.p99_ms:>8.2f} ms  {result.throughput_rps:>8.1f} req/s  errors {result.errors}"
+                )
+    finally:
+        await teardown(engine, schema)
+
+    return results
+
+
+def regressions(results: dict[str, Result], baseline: dict[str, Any], threshold: float) -> list[str]:
+    found = []
+    for name, base in baseline["endpoints"].items():
+        result = results.get(name)
+        if result is None:
+            continue
+        if result.p95_ms > base["p95_ms"] * (1 + threshold):
+            found.append(f"{name}: p95 {base['p95_ms']:.2f} -> {result.p95_ms:.2f} ms")
+        if result.throughput_rps < base["throughput_rps"] * (1 - threshold):
+            found.append(f"{name}: throughput {base['throughput_rps']:.1f} -> {result.throughput_rps:.1f} req/s")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark API latency and throughput against a JSON baseline.")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--transactions-per-user", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", help="run the endpoints whose name contains one of these")
+    parser.add_argument("--database-url", help="async SQLAlchemy URL to use instead of a schema on the configured DB")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="record this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="tolerated relative p95 or throughput change")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    failed = [name for name, result in results.items() if result.errors]
+    if failed:
+        print(f"FAIL requests returned errors: {', '.join(failed)}")
+        sys.exit(1)
+
+    if args.update_baseline or not args.baseline.exists():
+        baseline = {
+            "spec": {"users": args.users, "transactions_per_user": args.transactions_per_user},
+            "concurrency": args.concurrency,
+            "endpoints": {name: asdict(result) for name, result in results.items()},
+        }
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return
+
+    found = regressions(results, json.loads(args.baseline.read_text()), args.threshold)
+    for regression in found:
+        print(f"REGRESSION {regression}")
+    if found:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
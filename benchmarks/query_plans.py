@@ -0,0 +1,177 @@
+"""
+Checks that the hot-path queries of the API are served by indexes.
+
+A throwaway schema is created and seeded on the configured database, every query below is
+EXPLAINed with sequential scans disabled, and the run fails if the planner still has to
+scan one of the tables: with `enable_seqscan = off` a Seq Scan only survives when no
+usable index exists.
+
+    python -m benchmarks.query_plans --users 20 --transactions-per-user 2000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Executable, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel, select
+
+import src.db as db
+import src.routers.budgets as budgets
+import src.routers.categories as categories
+import src.routers.goals as goals
+import src.routers.tags as tags
+import src.routers.transactions as transactions
+from benchmarks.seed import SeededUser, SeedSpec, seed
+from src.config import cfg
+from src.pagination import encode_cursor, page_query
+from src.schemas.categories import Category
+from src.schemas.goals import Goal
+from src.schemas.pagination import PageParams
+from src.schemas.tags import Tag
+from src.schemas.transactions import TransactionTagLink
+from src.search import names_search_query, terms, transactions_search_query
+
+FIRST_PAGE = PageParams(cursor=None, limit=cfg.pagination.default_size)
+NEXT_PAGE = PageParams(cursor=encode_cursor((datetime.utcnow(), 1_000_000_000)), limit=cfg.pagination.default_size)
+SEARCH_LIMIT = cfg.pagination.default_size
+
+
+@dataclass
+class PlanCheck:
+    name: str
+    statement: Executable
+
+
+def transactions_page(
+    page: PageParams,
+    user_id: int | None = None,
+    category_id: int | None = None,
+    description: str | None = None,
+) -> Executable:
+    query = transactions.transactions_query(user_id, category_id, description)
+    return page_query(query, transactions.PAGE_KEYS, page, descending=True)
+
+
+def hot_path_queries(user: SeededUser) -> list[PlanCheck]:
+    # built by the same functions the routers call, so a change to a route's query is checked as it ships
+    category_id, tag_id = user.category_ids[0], user.tag_ids[0]
+    dialect = postgresql.dialect.name
+    checks = [
+        PlanCheck("auth: find user by email", db.find_user_query(user.email)),
+        PlanCheck("transactions: first page of a user", transactions_page(FIRST_PAGE, user_id=user.id)),
+        PlanCheck("transactions: next page of a user", transactions_page(NEXT_PAGE, user_id=user.id)),
+        PlanCheck(
+            "transactions: user and category",
+            transactions_page(FIRST_PAGE, user_id=user.id, category_id=category_id),
+        ),
+        PlanCheck("transactions: by category", transactions_page(FIRST_PAGE, category_id=category_id)),
+        PlanCheck("transactions: by description", transactions_page(FIRST_PAGE, description="coffee")),
+        # the `selectinload(Transaction.tags)` of `/transactions/{id}/with-tags`, which the ORM builds itself
+        PlanCheck(
+            "transactions: tags of a transaction",
+            select(Tag).join(TransactionTagLink).where(TransactionTagLink.transaction_id.in_([1, 2, 3])),
+        ),
+        PlanCheck("transaction_tag: links of a transaction", db.unlink_tags_statement(1)),
+        # the foreign key check run by PostgreSQL when a tag is deleted
+        PlanCheck(
+            "transaction_tag: links of a tag",
+            select(TransactionTagLink).where(TransactionTagLink.tag_id == tag_id),
+        ),
+        PlanCheck(
+            "budgets: of a user", page_query(budgets.budgets_query(user.id, None), budgets.PAGE_KEYS, FIRST_PAGE)
+        ),
+        PlanCheck(
+            "budgets: of a category",
+            page_query(budgets.budgets_query(None, category_id), budgets.PAGE_KEYS, FIRST_PAGE),
+        ),
+        PlanCheck("goals: of a user", page_query(goals.goals_query(user.id, None), goals.PAGE_KEYS, FIRST_PAGE)),
+        PlanCheck("tags: of a user", page_query(tags.tags_query(user.id, None), tags.PAGE_KEYS, FIRST_PAGE)),
+        PlanCheck(
+            "categories: of a user",
+            page_query(categories.categories_query(user.id, None, None), categories.PAGE_KEYS, FIRST_PAGE),
+        ),
+        PlanCheck(
+            "search: transaction descriptions",
+            transactions_search_query(dialect, terms("coffee"), None).limit(SEARCH_LIMIT),
+        ),
+    ]
+    for model in (Category, Goal, Tag):
+        checks.append(
+            PlanCheck(
+                f"search: {model.__tablename__} names",
+                names_search_query(dialect, model, "coffee", None).limit(SEARCH_LIMIT),
+            )
+        )
+    return checks
+
+
+def seq_scans(plan: dict) -> list[str]:
+    found = [plan["Relation Name"]] if plan["Node Type"] == "Seq Scan" else []
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def explain(conn: AsyncConnection, statement: Executable) -> dict:
+    # compiled for the driver the text is run on: psycopg2's would double the `%` of LIKE patterns and operators
+    sql = statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    return result.scalar_one()[0]["Plan"]
+
+
+async def run(spec: SeedSpec) -> int:
+    schema = f"query_plans_{os.getpid()}"
+    engine = create_async_engine(
+        cfg.db.async_url,
+        poolclass=NullPool,
+        # `public` stays on the path for extension objects such as the pg_trgm operator classes, so tables
+        # are created without `checkfirst`: the ones in `public` would otherwise count as existing
+        connect_args={"server_settings": {"search_path": f"{schema}, public"}},
+    )
+
+    failures = 0
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"CREATE SCHEMA {schema}"))
+            await conn.run_sync(SQLModel.metadata.create_all, checkfirst=False)
+            users = await seed(conn, spec)
+
+        async with engine.connect() as conn:
+            await conn.execute(text("ANALYZE"))
+            await conn.execute(text("SET enable_seqscan = off"))
+
+            for check in hot_path_queries(users[0]):
+                scans = seq_scans(await explain(conn, check.statement))
+                failures += bool(scans)
+                status = f"FAIL seq scan on {', '.join(scans)}" if scans else "ok"
+                print(f"{check.name:<45} {status}")
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        await engine.dispose()
+
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fail if hot-path queries need a sequential scan.")
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--transactions-per-user", type=int, default=2000)
+    args = parser.parse_args()
+
+    spec = SeedSpec(users=args.users, transactions_per_user=args.transactions_per_user)
+    failures = asyncio.run(run(spec))
+    if failures:
+        print(f"{failures} hot-path queries are not covered by an index")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
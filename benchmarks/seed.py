@@ -0,0 +1,142 @@
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.schemas.budgets import Budget
+from src.schemas.categories import Category, CategoryType
+from src.schemas.goals import Goal
+from src.schemas.tags import Tag
+from src.schemas.transactions import Transaction, TransactionTagLink
+from src.schemas.users import User
+
+WORDS = [
+    "coffee", "groceries", "salary", "rent", "taxi", "cinema", "pharmacy", "gym", "books", "electricity",
+    "internet", "restaurant", "bonus", "insurance", "flowers", "concert", "train", "hotel", "market", "repair",
+]  # fmt: skip
+
+BATCH_SIZE = 5000
+
+
+@dataclass
+class SeedSpec:
+    users: int = 10
+    categories_per_user: int = 8
+    tags_per_user: int = 12
+    transactions_per_user: int = 1000
+    tags_per_transaction: int = 2
+    budgets_per_user: int = 4
+    goals_per_user: int = 3
+    history_days: int = 730
+    seed: int = 42
+
+
+@dataclass
+class SeededUser:
+    id: int
+    email: str
+    category_ids: list[int]
+    tag_ids: list[int]
+
+
+async def insert_returning_ids(conn: AsyncConnection, model: type, rows: list[dict]) -> list[int]:
+    ids = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start : start + BATCH_SIZE]
+        result = await conn.execute(insert(model).returning(model.id, sort_by_parameter_order=True), batch)
+        ids.extend(result.scalars().all())
+    return ids
+
+
+async def insert_rows(conn: AsyncConnection, model: type, rows: list[dict]) -> None:
+    for start in range(0, len(rows), BATCH_SIZE):
+        await conn.execute(insert(model), rows[start : start + BATCH_SIZE])
+
+
+async def seed(conn: AsyncConnection, spec: SeedSpec, password_hash: str = "") -> list[SeededUser]:
+    rnd = random.Random(spec.seed)
+    now = datetime.utcnow().replace(microsecond=0)
+
+    user_rows = [
+        {
+            "username": f"user{n}",
+            "email": f"user{n}@example.com",
+            "password": password_hash,
+            "birth_date": datetime(1990, 1, 1) + timedelta(days=n),
+            "created_at": now,
+        }
+        for n in range(spec.users)
+    ]
+    user_ids = await insert_returning_ids(conn, User, user_rows)
+
+    users = []
+    for user_id, row in zip(user_ids, user_rows):
+        category_rows = [
+            {
+                "name": f"{rnd.choice(WORDS)} {n}",
+                "type": CategoryType.income if n == 0 else CategoryType.expense,
+                "user_id": user_id,
+            }
+            for n in range(spec.categories_per_user)
+        ]
+        tag_rows = [{"name": f"{rnd.choice(WORDS)} {n}", "user_id": user_id} for n in range(spec.tags_per_user)]
+        users.append(
+            SeededUser(
+                id=user_id,
+                email=row["email"],
+                category_ids=await insert_returning_ids(conn, Category, category_rows),
+                tag_ids=await insert_returning_ids(conn, Tag, tag_rows),
+            )
+        )
+
+    for user in users:
+        transaction_rows = [
+            {
+                "user_id": user.id,
+                "category_id": rnd.choice(user.category_ids),
+                "amount": Decimal(rnd.randint(100, 50000)) / 100,
+                "date": now - timedelta(days=rnd.uniform(0, spec.history_days)),
+                "description": " ".join(rnd.sample(WORDS, 3)),
+            }
+            for _ in range(spec.transactions_per_user)
+        ]
+        transaction_ids = await insert_returning_ids(conn, Transaction, transaction_rows)
+
+        tags_per_transaction = min(spec.tags_per_transaction, len(user.tag_ids))
+        link_rows = [
+            {"transaction_id": transaction_id, "tag_id": tag_id}
+            for transaction_id in transaction_ids
+            for tag_id in rnd.sample(user.tag_ids, tags_per_transaction)
+        ]
+        await insert_rows(conn, TransactionTagLink, link_rows)
+
+        budget_rows = [
+            {
+                "limit_amount": Decimal(rnd.randint(100, 5000)),
+                "start_date": now - timedelta(days=rnd.randint(30, 365)),
+                "end_date": now + timedelta(days=rnd.randint(30, 365)),
+                "user_id": user.id,
+                "category_id": rnd.choice(user.category_ids),
+                "created_at": now,
+            }
+            for _ in range(spec.budgets_per_user)
+        ]
+        await insert_rows(conn, Budget, budget_rows)
+
+        goal_rows = [
+            {
+                "name": f"{rnd.choice(WORDS)} goal",
+                "deadline": now + timedelta(days=rnd.randint(30, 1000)),
+                "target_amount": Decimal(rnd.randint(1000, 100000)),
+                "current_amount": Decimal(rnd.randint(0, 1000)),
+                "user_id": user.id,
+                "created_at": now,
+            }
+            for _ in range(spec.goals_per_user)
+        ]
+        await insert_rows(conn, Goal, goal_rows)
+
+    return users
@@ -0,0 +1,135 @@
+"""
+Compares the two ways a transactions page can be produced.
+
+`orm` is the regular FastAPI path: ORM instances are loaded, validated against the response
+model and rendered by the stdlib json encoder. `rows` is the path `GET /transactions/` takes:
+Core column tuples mapped to dicts and rendered by orjson. Both run against a throwaway
+schema seeded on the configured database, the bodies are checked to decode to the same
+JSON and the median time of each stage is printed.
+
+    python -m benchmarks.serialization --rows 10000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Awaitable, Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from benchmarks.seed import SeedSpec, seed
+from src.config import cfg
+from src.pagination import paginate, paginate_rows
+from src.schemas.pagination import Page, PageParams
+from src.schemas.transactions import Transaction
+from src.serialization import FastJSONResponse, model_columns
+
+KEYS = (Transaction.date, Transaction.id)
+
+PAGE_FIELD = create_model_field(name="response", type_=Page[Transaction], mode="serialization")
+
+
+async def orm_page(session: AsyncSession, user_id: int, page: PageParams) -> Any:
+    query = select(Transaction).where(Transaction.user_id == user_id)
+    return await paginate(session, query, keys=KEYS, page=page, descending=True)
+
+
+async def orm_render(content: Any) -> bytes:
+    return JSONResponse(await serialize_response(field=PAGE_FIELD, response_content=content)).body
+
+
+async def rows_page(session: AsyncSession, user_id: int, page: PageParams) -> Any:
+    query = select(*model_columns(Transaction)).where(Transaction.user_id == user_id)
+    return await paginate_rows(session, query, keys=KEYS, page=page, descending=True)
+
+
+async def rows_render(content: Any) -> bytes:
+    return FastJSONResponse(content).body
+
+
+async def measure(
+    factory: async_sessionmaker,
+    load: Callable[[AsyncSession, int, PageParams], Awaitable[Any]],
+    render: Callable[[Any], Awaitable[bytes]],
+    user_id: int,
+    page: PageParams,
+    repeat: int,
+) -> tuple[float, float, bytes]:
+    load_times, render_times = [], []
+    for _ in range(repeat):
+        # a fresh session per run, so the identity map never serves a previous run's instances
+        async with factory() as session:
+            started = time.perf_counter()
+            content = await load(session, user_id, page)
+            loaded = time.perf_counter()
+            body = await render(content)
+            rendered = time.perf_counter()
+        load_times.append(loaded - started)
+        render_times.append(rendered - loaded)
+    return statistics.median(load_times), statistics.median(render_times), body
+
+
+async def run(rows: int, repeat: int) -> bool:
+    schema = f"serialization_{os.getpid()}"
+    engine = create_async_engine(
+        cfg.db.async_url,
+        poolclass=NullPool,
+        # see `benchmarks/query_plans.py` on keeping `public` on the path
+        connect_args={"server_settings": {"search_path": f"{schema}, public"}},
+    )
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"CREATE SCHEMA {schema}"))
+            await conn.run_sync(SQLModel.metadata.create_all, checkfirst=False)
+            users = await seed(conn, SeedSpec(users=1, transactions_per_user=rows))
+
+        page = PageParams(limit=rows)
+        results = {
+            "orm": await measure(factory, orm_page, orm_render, users[0].id, page, repeat),
+            "rows": await measure(factory, rows_page, rows_render, users[0].id, page, repeat),
+        }
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        await engine.dispose()
+
+    print(f"{'path':<6} {'load, ms':>10} {'render, ms':>12} {'total, ms':>11} {'body, KiB':>11}")
+    for name, (load, render, body) in results.items():
+        total = (load + render) * 1000
+        print(f"{name:<6} {load * 1000:>10.1f} {render * 1000:>12.1f} {total:>11.1f} {len(body) / 1024:>11.1f}")
+
+    orm_load, orm_render_time, orm_body = results["orm"]
+    rows_load, rows_render_time, rows_body = results["rows"]
+    print(f"speedup: x{(orm_load + orm_render_time) / (rows_load + rows_render_time):.1f}")
+
+    same = json.loads(orm_body) == json.loads(rows_body)
+    if not same:
+        print("FAIL the two paths return different bodies")
+    return same
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare ORM and row-mapped serialization of a transactions page.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not asyncio.run(run(args.rows, args.repeat)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
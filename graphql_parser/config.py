@@ -31,9 +31,31 @@ class DataBaseConfig(ConfigBase):
         return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
 
 
+class PaginationConfig(ConfigBase):
+    model_config = SettingsConfigDict(env_prefix="PAGINATION_")
+
+    default_size: int = Field(50)
+    max_size: int = Field(500)
+
+
+class LimitsConfig(ConfigBase):
+    model_config = SettingsConfigDict(env_prefix="GRAPHQL_")
+
+    # deepest field nesting an operation may select
+    max_depth: int = Field(10)
+    # highest estimated cost, see `graphql_parser.cost`
+    max_cost: int = Field(20000)
+    # parsed and validated documents kept by query text
+    document_cache_size: int = Field(1024)
+    # persisted query texts kept by hash
+    persisted_queries_size: int = Field(1024)
+
+
 class Config(ConfigBase):
     uvicorn: UvicornConfig = Field(default_factory=UvicornConfig)
     db: DataBaseConfig = Field(default_factory=DataBaseConfig)
+    pagination: PaginationConfig = Field(default_factory=PaginationConfig)
+    limits: LimitsConfig = Field(default_factory=LimitsConfig)
 
     @classmethod
     def load(cls) -> "Config":
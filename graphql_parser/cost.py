@@ -0,0 +1,91 @@
+from typing import Any
+
+from graphql import (
+    FieldNode,
+    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLNamedType,
+    InlineFragmentNode,
+    IntValueNode,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    ValidationRule,
+    VariableNode,
+    get_named_type,
+)
+
+# arguments that bound how many items a list field returns
+LIST_SIZE_ARGUMENTS = ("first",)
+
+
+def query_cost_rule(max_cost: int, default_list_size: int) -> type[ValidationRule]:
+    """
+    A validation rule rejecting operations whose estimated cost exceeds `max_cost`.
+
+    Every selected field costs 1, and the fields below a list-size argument are multiplied by it:
+    `users(first: 50) { transactions(first: 20) { id } }` costs 1 + 50 * (1 + 20 * 1). The estimate
+    is static, so it is cached along with the rest of the validation: a size passed as a variable
+    counts as the variable's default, or as `default_list_size` when it has none.
+    """
+
+    class QueryCostRule(ValidationRule):
+        def enter_operation_definition(self, node: OperationDefinitionNode, *_: Any) -> None:
+            defaults = {
+                definition.variable.name.value: definition.default_value
+                for definition in node.variable_definitions or ()
+            }
+            root = self.context.schema.get_root_type(node.operation)
+            cost = self.selection_cost(node.selection_set, root, defaults, frozenset())
+            if cost > max_cost:
+                self.report_error(GraphQLError(f"Query cost {cost} exceeds the maximum of {max_cost}.", node))
+
+        def selection_cost(
+            self,
+            selection_set: SelectionSetNode | None,
+            parent: GraphQLNamedType | None,
+            defaults: dict[str, Any],
+            fragments: frozenset[str],
+        ) -> int:
+            if selection_set is None or parent is None:
+                return 0
+
+            cost = 0
+            for selection in selection_set.selections:
+                if isinstance(selection, FieldNode):
+                    field = getattr(parent, "fields", {}).get(selection.name.value)
+                    if field is None:
+                        # meta fields cost nothing, unknown ones are reported by the standard rules
+                        continue
+                    children = self.selection_cost(
+                        selection.selection_set, get_named_type(field.type), defaults, fragments
+                    )
+                    cost += 1 + self.list_size(selection, field, defaults) * children
+                elif isinstance(selection, InlineFragmentNode):
+                    condition = selection.type_condition
+                    fragment_type = self.context.schema.get_type(condition.name.value) if condition else parent
+                    cost += self.selection_cost(selection.selection_set, fragment_type, defaults, fragments)
+                elif isinstance(selection, FragmentSpreadNode):
+                    name = selection.name.value
+                    fragment = self.context.get_fragment(name)
+                    # a fragment cycle is reported by the standard rules, it only must not recurse forever here
+                    if fragment is None or name in fragments:
+                        continue
+                    fragment_type = self.context.schema.get_type(fragment.type_condition.name.value)
+                    cost += self.selection_cost(fragment.selection_set, fragment_type, defaults, fragments | {name})
+            return cost
+
+        def list_size(self, selection: FieldNode, field: Any, defaults: dict[str, Any]) -> int:
+            for name in LIST_SIZE_ARGUMENTS:
+                if name not in field.args:
+                    continue
+
+                value = next((arg.value for arg in selection.arguments or () if arg.name.value == name), None)
+                if value is None:
+                    default = field.args[name].default_value
+                    return default if isinstance(default, int) else default_list_size
+                if isinstance(value, VariableNode):
+                    value = defaults.get(value.name.value)
+                return int(value.value) if isinstance(value, IntValueNode) else default_list_size
+            return 1
+
+    return QueryCostRule
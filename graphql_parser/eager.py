@@ -0,0 +1,73 @@
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+from strawberry.types import Info
+from strawberry.types.nodes import FragmentSpread, InlineFragment, SelectedField, Selection
+
+from graphql_parser.models import Budget, Transaction, User
+
+# relationships whose fields resolve from the loaded rows, by the GraphQL field exposing them;
+# paginated ones such as `User.transactions` are batched by `graphql_parser.loaders` instead
+EAGER_RELATIONSHIPS: dict[type, frozenset[str]] = {
+    User: frozenset({"categories", "tags", "budgets", "goals"}),
+    Transaction: frozenset({"category", "tags"}),
+    Budget: frozenset({"category"}),
+}
+
+# relationships to load below a model: `(("budgets", (("category", ()),)), ("tags", ()))`;
+# nested tuples, so a plan can be part of a DataLoader key
+Plan = tuple[tuple[str, "Plan"], ...]
+
+
+def fields(selections: Iterable[Selection]) -> Iterator[SelectedField]:
+    """The fields of a selection set, with those of its fragments."""
+    for selection in selections:
+        if isinstance(selection, (FragmentSpread, InlineFragment)):
+            yield from fields(selection.selections)
+        else:
+            yield selection
+
+
+def subfields(selections: Iterable[Selection], *path: str) -> list[Selection]:
+    """The selections below `path`, e.g. of the nodes of a connection with `subfields(..., "edges", "node")`."""
+    for name in path:
+        selections = [child for field in fields(selections) if field.name == name for child in field.selections]
+    return list(selections)
+
+
+def load_plan(model: type, selections: Iterable[Selection]) -> Plan:
+    """The relationships the selections read from `model` rows, down to the last nested one."""
+    eager = EAGER_RELATIONSHIPS.get(model, frozenset())
+    requested: dict[str, list[Selection]] = {}
+    for field in fields(selections):
+        if field.name in eager:
+            # the same relationship may be selected more than once, under aliases or fragments
+            requested.setdefault(field.name, []).extend(field.selections)
+
+    relationships = inspect(model).relationships
+    return tuple(
+        (name, load_plan(relationships[name].mapper.class_, children)) for name, children in sorted(requested.items())
+    )
+
+
+def load_options(entity: Any, plan: Plan) -> list[Any]:
+    """
+    Loader options for a plan: a join for a single related row, and one more `SELECT ... IN` for a collection,
+    so that a query loads the whole plan in as many statements as it has collections.
+    """
+    relationships = inspect(entity).mapper.relationships
+    options = []
+    for name, children in plan:
+        relationship = relationships[name]
+        attribute = getattr(entity, name)
+        option = selectinload(attribute) if relationship.uselist else joinedload(attribute)
+        if children:
+            option = option.options(*load_options(relationship.mapper.class_, children))
+        options.append(option)
+    return options
+
+
+def selected(info: Info, *path: str) -> list[Selection]:
+    """The selections below the field being resolved, and below `path` within it."""
+    return subfields([child for field in info.selected_fields for child in field.selections], *path)
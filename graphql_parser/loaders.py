@@ -0,0 +1,105 @@
+import asyncio
+from collections import defaultdict
+from typing import Any
+
+from sqlalchemy import ARRAY, Integer, Result, any_, bindparam, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import InstrumentedAttribute, aliased
+from strawberry.dataloader import DataLoader
+
+from graphql_parser.eager import Plan, load_options
+from graphql_parser.models import Transaction
+
+
+class SerialSession:
+    """
+    The request session for resolvers. Sibling fields resolve concurrently, but an `AsyncSession`
+    runs one statement at a time, so statements wait for each other here.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.lock = asyncio.Lock()
+
+    async def execute(self, statement: Any) -> Result:
+        async with self.lock:
+            return await self.session.execute(statement)
+
+    async def scalar(self, statement: Any) -> Any:
+        async with self.lock:
+            return await self.session.scalar(statement)
+
+
+def matches_any(column: InstrumentedAttribute, keys: list[int]) -> Any:
+    # one array parameter, so every batch size shares a single prepared statement
+    return column == any_(bindparam(f"{column.key}_keys", sorted(set(keys)), type_=ARRAY(Integer)))
+
+
+def one_to_many_page(
+    session: SerialSession, column: InstrumentedAttribute, plan: Plan = ()
+) -> DataLoader[tuple[int, int, int | None], list[Any]]:
+    """
+    Loads a page of the children of many parents at once, keyed by `(parent, limit, after)`: at most
+    `limit` children with an id above `after` per parent. A window function ranks the children of
+    every parent, so the page is one query per resolver level. The relationships in `plan` are loaded along.
+    """
+    model = column.class_
+
+    async def load(keys: list[tuple[int, int, int | None]]) -> list[list[Any]]:
+        windows = defaultdict(list)
+        for parent, limit, after in keys:
+            windows[limit, after].append(parent)
+
+        pages = defaultdict(list)
+        for (limit, after), parents in windows.items():
+            rank = func.row_number().over(partition_by=column, order_by=model.id).label("rank")
+            ranked = select(model, rank).where(matches_any(column, parents))
+            if after is not None:
+                ranked = ranked.where(model.id > after)
+            ranked = ranked.subquery()
+
+            row = aliased(model, ranked)
+            result = await session.execute(
+                select(row)
+                .where(ranked.c.rank <= limit)
+                .order_by(ranked.c[column.key], ranked.c.id)
+                .options(*load_options(row, plan))
+            )
+            for child in result.scalars():
+                pages[getattr(child, column.key), limit, after].append(child)
+
+        return [pages[key] for key in keys]
+
+    return DataLoader(load_fn=load)
+
+
+def count_by(session: SerialSession, column: InstrumentedAttribute) -> DataLoader[int, int]:
+    """Counts the children of many parents at once."""
+
+    async def load(keys: list[int]) -> list[int]:
+        result = await session.execute(
+            select(column, func.count()).where(matches_any(column, keys)).group_by(column)
+        )
+        counts = dict(result.all())
+        return [counts.get(key, 0) for key in keys]
+
+    return DataLoader(load_fn=load)
+
+
+class Loaders:
+    """
+    DataLoaders of one request. They batch the lookups of sibling resolvers and cache them by key,
+    so they must never outlive the request session they read from.
+    """
+
+    def __init__(self, session: SerialSession):
+        self.session = session
+        self.transaction_pages: dict[Plan, DataLoader] = {}
+        self.transaction_count_by_user = count_by(session, Transaction.user_id)
+
+    def transactions_by_user(self, plan: Plan) -> DataLoader[tuple[int, int, int | None], list[Transaction]]:
+        # one loader per plan: the users of one response level select the same fields, so they still share it
+        if plan not in self.transaction_pages:
+            self.transaction_pages[plan] = one_to_many_page(self.session, Transaction.user_id, plan)
+        return self.transaction_pages[plan]
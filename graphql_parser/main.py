@@ -1,23 +1,57 @@
 import uvicorn
 import strawberry
 from fastapi import FastAPI, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from strawberry.extensions import AddValidationRules, ParserCache, ValidationCache
+from strawberry.extensions.query_depth_limiter import create_validator
 from strawberry.fastapi import GraphQLRouter
 
+from prometheus_client import make_asgi_app
 from graphql_parser.schema import Query
-from graphql_parser.db import get_session
+from graphql_parser.db import async_engine, get_session
 from graphql_parser.config import cfg
+from graphql_parser.loaders import Loaders, SerialSession
+from graphql_parser.metrics import QueryCountExtension, instrument_engine
+from graphql_parser.cost import query_cost_rule
+from graphql_parser.persisted_queries import PersistedQueries, QueryTexts
+
+
+async def context_getter(session: AsyncSession = Depends(get_session)) -> dict:
+    # loaders cache what they read, so every request gets fresh ones bound to its own session
+    db = SerialSession(session)
+    return {"db": db, "loaders": Loaders(db)}
 
 
 def create_app() -> FastAPI:
     app = FastAPI()
 
-    schema = strawberry.Schema(query=Query)
+    instrument_engine(async_engine)
+
+    # rule classes and caches are built once: the validation cache is keyed by the rule classes too
+    validation_rules = [
+        create_validator(cfg.limits.max_depth, should_ignore=None),
+        query_cost_rule(cfg.limits.max_cost, default_list_size=cfg.pagination.max_size),
+    ]
+    persisted_texts = QueryTexts(cfg.limits.persisted_queries_size)
+
+    schema = strawberry.Schema(
+        query=Query,
+        extensions=[
+            # first: a hook raising on entry leaves the hooks entered before it unfinished
+            lambda: PersistedQueries(persisted_texts),
+            QueryCountExtension,
+            lambda: ParserCache(maxsize=cfg.limits.document_cache_size),
+            lambda: ValidationCache(maxsize=cfg.limits.document_cache_size),
+            lambda: AddValidationRules(validation_rules),
+        ],
+    )
     graphql_app = GraphQLRouter(
         schema,
-        context_getter=lambda db=Depends(get_session): {"db": db}
+        context_getter=context_getter
     )
 
     app.include_router(graphql_app, prefix="/graphql")
+    app.mount("/metrics", make_asgi_app())
 
     return app
 
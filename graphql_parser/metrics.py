@@ -0,0 +1,73 @@
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from prometheus_client import Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from strawberry.extensions import SchemaExtension
+
+DB_QUERIES_PER_OPERATION = Histogram(
+    "graphql_db_queries_per_operation",
+    "SQL statements executed while resolving a GraphQL operation, by operation name.",
+    ["operation"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+
+DB_TIME_PER_OPERATION = Histogram(
+    "graphql_db_time_per_operation_seconds",
+    "Total time spent in SQL statements while resolving a GraphQL operation, by operation name.",
+    ["operation"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+# resolvers run in tasks and greenlets that copy the operation's context, so they all see the same counter
+current_counter: ContextVar[QueryCounter | None] = ContextVar("current_counter", default=None)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context.query_counter_started = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = current_counter.get()
+    if counter is not None:
+        counter.count += 1
+        counter.duration += time.perf_counter() - context.query_counter_started
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "after_cursor_execute", after_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+
+
+class QueryCountExtension(SchemaExtension):
+    """Counts the SQL statements of every operation, exports them and returns the count in `extensions`."""
+
+    # stays unset when an extension before this one rejects the operation
+    counter: QueryCounter | None = None
+
+    def on_operation(self):
+        self.counter = QueryCounter()
+        token = current_counter.set(self.counter)
+        try:
+            yield
+        finally:
+            current_counter.reset(token)
+            operation = self.execution_context.operation_name or "anonymous"
+            DB_QUERIES_PER_OPERATION.labels(operation=operation).observe(self.counter.count)
+            DB_TIME_PER_OPERATION.labels(operation=operation).observe(self.counter.duration)
+
+    def get_results(self) -> dict[str, Any]:
+        if self.counter is None:
+            return {}
+        return {"queries": self.counter.count}
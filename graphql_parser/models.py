@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, Numeric, ForeignKey, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -11,10 +11,22 @@ class User(Base):
     id = Column(Integer, primary_key=True)
     username = Column(String(50), nullable=False)
     email = Column(String(50), nullable=False)
-    birth_date = Column(Date, nullable=False)
-    created_at = Column(Date, nullable=False)
+    birth_date = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False)
 
     transactions = relationship("Transaction", back_populates="user")
+    categories = relationship("Category", back_populates="user", order_by="Category.id")
+    tags = relationship("Tag", back_populates="user", order_by="Tag.id")
+    budgets = relationship("Budget", back_populates="user", order_by="Budget.id")
+    goals = relationship("Goal", back_populates="user", order_by="Goal.id")
+
+
+class TransactionTag(Base):
+    __tablename__ = "transaction_tag"
+
+    id = Column(Integer, primary_key=True)
+    transaction_id = Column(Integer, ForeignKey("transaction.id"), nullable=False)
+    tag_id = Column(Integer, ForeignKey("tag.id"), nullable=False)
 
 
 class Transaction(Base):
@@ -24,7 +36,60 @@ class Transaction(Base):
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("category.id"), nullable=False)
     amount = Column(Numeric(10, 2), nullable=False)
-    date = Column(Date, nullable=False)
+    date = Column(DateTime, nullable=False)
     description = Column(Text)
 
     user = relationship("User", back_populates="transactions")
+    category = relationship("Category")
+    tags = relationship("Tag", secondary="transaction_tag", order_by="Tag.id")
+
+
+class Category(Base):
+    __tablename__ = "category"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    name = Column(String, nullable=False)
+    # `income` or `expense`, a PostgreSQL enum in the API's schema
+    type = Column(String, nullable=False)
+
+    user = relationship("User", back_populates="categories")
+
+
+class Tag(Base):
+    __tablename__ = "tag"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    name = Column(String, nullable=False)
+
+    user = relationship("User", back_populates="tags")
+
+
+class Budget(Base):
+    __tablename__ = "budget"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    category_id = Column(Integer, ForeignKey("category.id"), nullable=False)
+    limit_amount = Column(Numeric, nullable=False)
+    start_date = Column(DateTime, nullable=False)
+    end_date = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+    user = relationship("User", back_populates="budgets")
+    category = relationship("Category")
+
+
+class Goal(Base):
+    __tablename__ = "goal"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
+    name = Column(String, nullable=False)
+    deadline = Column(DateTime, nullable=False)
+    target_amount = Column(Numeric, nullable=False)
+    current_amount = Column(Numeric, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+    user = relationship("User", back_populates="goals")
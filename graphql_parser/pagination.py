@@ -0,0 +1,79 @@
+import base64
+import binascii
+import json
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+import strawberry
+
+from graphql_parser.config import cfg
+
+NodeType = TypeVar("NodeType")
+
+
+@strawberry.type
+class PageInfo:
+    has_next_page: bool
+    has_previous_page: bool
+    start_cursor: str | None
+    end_cursor: str | None
+
+
+@strawberry.type
+class Edge(Generic[NodeType]):
+    node: NodeType
+    cursor: str
+
+
+@strawberry.type
+class Connection(Generic[NodeType]):
+    edges: list[Edge[NodeType]]
+    page_info: PageInfo
+    count: strawberry.Private[Callable[[], Awaitable[int]]]
+
+    @strawberry.field
+    async def total_count(self) -> int:
+        # a full count can cost more than the page itself, so it only runs when the field is selected
+        return await self.count()
+
+
+def encode_cursor(key: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([key]).encode()).decode()
+
+
+def decode_cursor(cursor: str | None) -> int | None:
+    if cursor is None:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != 1 or not isinstance(values[0], int):
+            raise ValueError
+        return values[0]
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def check_first(first: int) -> int:
+    if not 1 <= first <= cfg.pagination.max_size:
+        raise ValueError(f"`first` must be between 1 and {cfg.pagination.max_size}")
+    return first
+
+
+def connection(
+    rows: list[Any],
+    first: int,
+    after: int | None,
+    to_node: Callable[[Any], NodeType],
+    count: Callable[[], Awaitable[int]],
+) -> Connection[NodeType]:
+    """Builds a page from up to `first + 1` rows ordered by id: the extra row only tells that a next page exists."""
+    edges = [Edge(node=to_node(row), cursor=encode_cursor(row.id)) for row in rows[:first]]
+    return Connection(
+        edges=edges,
+        page_info=PageInfo(
+            has_next_page=len(rows) > first,
+            has_previous_page=after is not None,
+            start_cursor=edges[0].cursor if edges else None,
+            end_cursor=edges[-1].cursor if edges else None,
+        ),
+        count=count,
+    )
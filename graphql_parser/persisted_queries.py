@@ -0,0 +1,67 @@
+import hashlib
+from collections import OrderedDict
+from typing import Iterator
+
+from graphql import GraphQLError
+from strawberry.extensions import SchemaExtension
+
+
+class QueryTexts:
+    """LRU cache of persisted query texts by their SHA-256 hash."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.texts: OrderedDict[str, str] = OrderedDict()
+
+    def get(self, digest: str) -> str | None:
+        text = self.texts.get(digest)
+        if text is not None:
+            self.texts.move_to_end(digest)
+        return text
+
+    def put(self, digest: str, text: str) -> None:
+        self.texts[digest] = text
+        self.texts.move_to_end(digest)
+        if len(self.texts) > self.maxsize:
+            self.texts.popitem(last=False)
+
+
+class PersistedQueries(SchemaExtension):
+    """
+    Automatic persisted queries, in the protocol Apollo clients speak.
+
+    A client first sends only `extensions.persistedQuery.sha256Hash`; on `PersistedQueryNotFound`
+    it retries with the query text too, which is stored once it validates. A known hash is turned
+    back into its text, so `ParserCache` and `ValidationCache` hand out the already parsed and
+    validated document and the request skips both steps.
+    """
+
+    def __init__(self, texts: QueryTexts):
+        super().__init__()
+        self.texts = texts
+
+    def on_operation(self) -> Iterator[None]:
+        context = self.execution_context
+        persisted = (context.operation_extensions or {}).get("persistedQuery")
+        if not isinstance(persisted, dict):
+            yield
+            return
+
+        if persisted.get("version") != 1:
+            raise GraphQLError("Unsupported persisted query version.", extensions={"code": "PERSISTED_QUERY_VERSION"})
+        digest = persisted.get("sha256Hash")
+
+        if context.query is None:
+            context.query = self.texts.get(digest)
+            if context.query is None:
+                raise GraphQLError("PersistedQueryNotFound", extensions={"code": "PERSISTED_QUERY_NOT_FOUND"})
+            yield
+            return
+
+        if hashlib.sha256(context.query.encode()).hexdigest() != digest:
+            raise GraphQLError("provided sha does not match query", extensions={"code": "INVALID_SHA256_HASH"})
+
+        yield
+
+        if not context.pre_execution_errors:
+            self.texts.put(digest, context.query)
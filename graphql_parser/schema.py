@@ -1,17 +1,131 @@
+from datetime import datetime
+from enum import Enum
+from typing import Annotated
+
 import strawberry
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func
 from strawberry.types import Info
 from sqlalchemy.future import select
 
-from graphql_parser.models import User, Transaction
+from graphql_parser.config import cfg
+from graphql_parser.eager import load_options, load_plan, selected
+from graphql_parser.loaders import Loaders, SerialSession
+from graphql_parser.models import Budget, Category, Goal, Tag, User, Transaction
+from graphql_parser.pagination import Connection, check_first, connection, decode_cursor
+
+First = Annotated[int, strawberry.argument(description=f"Page size, at most {cfg.pagination.max_size}")]
+After = Annotated[str | None, strawberry.argument(description="`endCursor` of the previous page")]
+
+
+@strawberry.enum
+class CategoryKind(Enum):
+    INCOME = "income"
+    EXPENSE = "expense"
+
+
+@strawberry.type
+class CategoryType:
+    id: int
+    name: str
+    type: CategoryKind
+
+    @classmethod
+    def from_row(cls, c: Category) -> "CategoryType":
+        return cls(
+            id=c.id,
+            name=c.name,
+            type=CategoryKind(c.type)
+        )
+
+
+@strawberry.type
+class TagType:
+    id: int
+    name: str
+
+    @classmethod
+    def from_row(cls, t: Tag) -> "TagType":
+        return cls(
+            id=t.id,
+            name=t.name
+        )
+
+
+# relationship fields below read the rows' relationships, loaded along by the resolver
+# that queried the rows, as planned from the selection set by `graphql_parser.eager`
 
 
 @strawberry.type
 class TransactionType:
     id: int
     amount: float
-    date: str
+    date: datetime
     description: str
+    row: strawberry.Private[Transaction]
+
+    @classmethod
+    def from_row(cls, t: Transaction) -> "TransactionType":
+        return cls(
+            id=t.id,
+            amount=float(t.amount),
+            date=t.date,
+            description=t.description or "",
+            row=t
+        )
+
+    @strawberry.field
+    def category(self) -> CategoryType:
+        return CategoryType.from_row(self.row.category)
+
+    @strawberry.field
+    def tags(self) -> list[TagType]:
+        return [TagType.from_row(tag) for tag in self.row.tags]
+
+
+@strawberry.type
+class BudgetType:
+    id: int
+    limit_amount: float
+    start_date: datetime
+    end_date: datetime
+    created_at: datetime
+    row: strawberry.Private[Budget]
+
+    @classmethod
+    def from_row(cls, b: Budget) -> "BudgetType":
+        return cls(
+            id=b.id,
+            limit_amount=float(b.limit_amount),
+            start_date=b.start_date,
+            end_date=b.end_date,
+            created_at=b.created_at,
+            row=b
+        )
+
+    @strawberry.field
+    def category(self) -> CategoryType:
+        return CategoryType.from_row(self.row.category)
+
+
+@strawberry.type
+class GoalType:
+    id: int
+    name: str
+    deadline: datetime
+    target_amount: float
+    current_amount: float
+    created_at: datetime
+
+    @classmethod
+    def from_row(cls, g: Goal) -> "GoalType":
+        return cls(
+            id=g.id,
+            name=g.name,
+            deadline=g.deadline,
+            target_amount=float(g.target_amount),
+            current_amount=float(g.current_amount),
+            created_at=g.created_at
+        )
 
 
 @strawberry.type
@@ -19,63 +133,104 @@ class UserType:
     id: int
     username: str
     email: str
+    row: strawberry.Private[User]
+
+    @classmethod
+    def from_row(cls, u: User) -> "UserType":
+        return cls(
+            id=u.id,
+            username=u.username,
+            email=u.email,
+            row=u
+        )
 
     @strawberry.field
-    async def transactions(self, info: Info) -> list[TransactionType]:
-        db: AsyncSession = info.context["db"]
-        result = await db.execute(select(Transaction).where(Transaction.user_id == self.id))
-        transactions = result.scalars().all()  # <-- FIX
-        return [
-            TransactionType(
-                id=t.id,
-                amount=float(t.amount),
-                date=str(t.date),
-                description=t.description or ""
-            )
-            for t in transactions
-        ]
+    def categories(self) -> list[CategoryType]:
+        return [CategoryType.from_row(category) for category in self.row.categories]
+
+    @strawberry.field
+    def tags(self) -> list[TagType]:
+        return [TagType.from_row(tag) for tag in self.row.tags]
+
+    @strawberry.field
+    def budgets(self) -> list[BudgetType]:
+        return [BudgetType.from_row(budget) for budget in self.row.budgets]
+
+    @strawberry.field
+    def goals(self) -> list[GoalType]:
+        return [GoalType.from_row(goal) for goal in self.row.goals]
+
+    @strawberry.field
+    async def transactions(
+        self,
+        info: Info,
+        first: First = cfg.pagination.default_size,
+        after: After = None,
+    ) -> Connection[TransactionType]:
+        # batched with the other users of the same response level, see `graphql_parser.loaders`
+        loaders: Loaders = info.context["loaders"]
+        first, after_id = check_first(first), decode_cursor(after)
+        plan = load_plan(Transaction, selected(info, "edges", "node"))
+        transactions = await loaders.transactions_by_user(plan).load((self.id, first + 1, after_id))
+        return connection(
+            transactions,
+            first,
+            after_id,
+            TransactionType.from_row,
+            count=lambda: loaders.transaction_count_by_user.load(self.id),
+        )
 
 
 @strawberry.type
 class Query:
     @strawberry.field
-    async def users(self, info: Info) -> list[UserType]:
-        db: AsyncSession = info.context["db"]
-        result = await db.execute(select(User))
-        users = result.scalars().all()  # <-- FIX
-        return [
-            UserType(
-                id=u.id,
-                username=u.username,
-                email=u.email
-            )
-            for u in users
-        ]
+    async def users(
+        self, info: Info, first: First = cfg.pagination.default_size, after: After = None
+    ) -> Connection[UserType]:
+        db: SerialSession = info.context["db"]
+        first, after_id = check_first(first), decode_cursor(after)
+
+        plan = load_plan(User, selected(info, "edges", "node"))
+        query = select(User).order_by(User.id).limit(first + 1).options(*load_options(User, plan))
+        if after_id is not None:
+            query = query.where(User.id > after_id)
+
+        result = await db.execute(query)
+        return connection(
+            result.scalars().all(),
+            first,
+            after_id,
+            UserType.from_row,
+            count=lambda: db.scalar(select(func.count()).select_from(User)),
+        )
 
     @strawberry.field
-    async def transactions(self, info: Info) -> list[TransactionType]:
-        db: AsyncSession = info.context["db"]
-        result = await db.execute(select(Transaction))
-        transactions = result.scalars().all()  # <-- FIX
-        return [
-            TransactionType(
-                id=t.id,
-                amount=float(t.amount),
-                date=str(t.date),
-                description=t.description or ""
-            )
-            for t in transactions
-        ]
+    async def transactions(
+        self, info: Info, first: First = cfg.pagination.default_size, after: After = None
+    ) -> Connection[TransactionType]:
+        db: SerialSession = info.context["db"]
+        first, after_id = check_first(first), decode_cursor(after)
+
+        plan = load_plan(Transaction, selected(info, "edges", "node"))
+        query = select(Transaction).order_by(Transaction.id).limit(first + 1).options(*load_options(Transaction, plan))
+        if after_id is not None:
+            query = query.where(Transaction.id > after_id)
+
+        result = await db.execute(query)
+        return connection(
+            result.scalars().all(),
+            first,
+            after_id,
+            TransactionType.from_row,
+            count=lambda: db.scalar(select(func.count()).select_from(Transaction)),
+        )
 
     @strawberry.field
     async def user_by_id(self, info: Info, id: int) -> UserType | None:
-        db: AsyncSession = info.context["db"]
-        result = await db.execute(select(User).where(User.id == id))
-        user = result.scalar_one_or_none()  # <-- OK as-is
+        db: SerialSession = info.context["db"]
+        plan = load_plan(User, selected(info))
+        result = await db.execute(select(User).where(User.id == id).options(*load_options(User, plan)))
+        user = result.scalar_one_or_none()
         if user:
-            return UserType(
-                id=user.id,
-                username=user.username,
-                email=user.email
-            )
+            return UserType.from_row(user)
         return None
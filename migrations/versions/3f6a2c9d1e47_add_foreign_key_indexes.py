@@ -0,0 +1,43 @@
+"""add foreign key indexes
+
+Revision ID: 3f6a2c9d1e47
+Revises: 0bd0650edecd
+Create Date: 2026-10-18 09:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6a2c9d1e47'
+down_revision: Union[str, None] = '0bd0650edecd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns); they mirror the filters and orderings used by the routers
+INDEXES = [
+    ("ix_transaction_user_id_date_id", "transaction", ["user_id", "date", "id"]),
+    ("ix_transaction_category_id", "transaction", ["category_id"]),
+    ("ix_transaction_tag_tag_id", "transaction_tag", ["tag_id"]),
+    ("ix_budget_user_id", "budget", ["user_id"]),
+    ("ix_budget_category_id", "budget", ["category_id"]),
+    ("ix_category_user_id", "category", ["user_id"]),
+    ("ix_tag_user_id", "tag", ["user_id"]),
+    ("ix_goal_user_id", "goal", ["user_id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # tables may already carry these indexes when they were bootstrapped by `db.init()`
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,51 @@
+"""add budget usage
+
+Revision ID: 5d9e3a7b2f14
+Revises: c27e94b1a6d3
+Create Date: 2026-10-18 15:32:10.402716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d9e3a7b2f14'
+down_revision: Union[str, None] = 'c27e94b1a6d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'budget_usage',
+        sa.Column('budget_id', sa.Integer(), nullable=False),
+        sa.Column('spent', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['budget_id'], ['budget.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('budget_id'),
+        if_not_exists=True,
+    )
+    # backfill counters of the existing budgets; the table may already exist when bootstrapped by `db.init()`
+    op.execute(
+        """
+        INSERT INTO budget_usage (budget_id, spent, transaction_count, updated_at)
+        SELECT budget.id, coalesce(sum(transaction.amount), 0), count(transaction.id), now()
+        FROM budget
+        LEFT JOIN transaction
+            ON transaction.user_id = budget.user_id
+            AND transaction.category_id = budget.category_id
+            AND transaction.date BETWEEN budget.start_date AND budget.end_date
+        GROUP BY budget.id
+        ON CONFLICT (budget_id) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('budget_usage', if_exists=True)
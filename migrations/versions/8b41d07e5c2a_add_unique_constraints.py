@@ -0,0 +1,48 @@
+"""add unique constraints
+
+Revision ID: 8b41d07e5c2a
+Revises: 3f6a2c9d1e47
+Create Date: 2026-10-18 09:20:05.673390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b41d07e5c2a'
+down_revision: Union[str, None] = '3f6a2c9d1e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # the same tag could be linked to a transaction more than once, keep the oldest link
+    op.execute(
+        """
+        DELETE FROM transaction_tag AS duplicate
+        USING transaction_tag AS original
+        WHERE duplicate.transaction_id = original.transaction_id
+          AND duplicate.tag_id = original.tag_id
+          AND duplicate.id > original.id
+        """
+    )
+    # leading transaction_id column also serves the lookups of a transaction's tags
+    op.create_index(
+        "uq_transaction_tag_transaction_id_tag_id",
+        "transaction_tag",
+        ["transaction_id", "tag_id"],
+        unique=True,
+        if_not_exists=True,
+    )
+    # used by every login and token check; fails loudly if duplicated emails were registered
+    op.create_index("uq_user_email", "user", ["email"], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_user_email", table_name="user", if_exists=True)
+    op.drop_index("uq_transaction_tag_transaction_id_tag_id", table_name="transaction_tag", if_exists=True)
@@ -0,0 +1,49 @@
+"""add daily balance
+
+Revision ID: a81f6c0d4b93
+Revises: 5d9e3a7b2f14
+Create Date: 2026-10-18 16:48:52.117305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a81f6c0d4b93'
+down_revision: Union[str, None] = '5d9e3a7b2f14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'daily_balance',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['category.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'day', 'category_id'),
+        if_not_exists=True,
+    )
+    # backfill from the existing history; the table may already exist when bootstrapped by `db.init()`
+    op.execute(
+        """
+        INSERT INTO daily_balance (user_id, day, category_id, amount, transaction_count)
+        SELECT user_id, date(date), category_id, sum(amount), count(id)
+        FROM transaction
+        GROUP BY user_id, date(date), category_id
+        ON CONFLICT (user_id, day, category_id) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_balance', if_exists=True)
@@ -0,0 +1,62 @@
+"""add search indexes
+
+Revision ID: c27e94b1a6d3
+Revises: 8b41d07e5c2a
+Create Date: 2026-10-18 14:05:27.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c27e94b1a6d3'
+down_revision: Union[str, None] = '8b41d07e5c2a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column) for substring and fuzzy search
+TRIGRAM_INDEXES = [
+    ("ix_transaction_description_trgm", "transaction", "description"),
+    ("ix_category_name_trgm", "category", "name"),
+    ("ix_tag_name_trgm", "tag", "name"),
+    ("ix_goal_name_trgm", "goal", "name"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+            if_not_exists=True,
+        )
+
+    op.execute(
+        "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS description_tsv tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(description, ''))) STORED"
+    )
+    op.create_index(
+        "ix_transaction_description_tsv",
+        "transaction",
+        ["description_tsv"],
+        postgresql_using="gin",
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_transaction_description_tsv", table_name="transaction", if_exists=True)
+    op.drop_column("transaction", "description_tsv")
+
+    for name, table, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
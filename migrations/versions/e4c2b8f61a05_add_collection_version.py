@@ -0,0 +1,37 @@
+"""add collection version
+
+Revision ID: e4c2b8f61a05
+Revises: a81f6c0d4b93
+Create Date: 2026-10-18 18:21:40.663187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c2b8f61a05'
+down_revision: Union[str, None] = 'a81f6c0d4b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'collection_version',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('collection', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'collection'),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('collection_version', if_exists=True)
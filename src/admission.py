@@ -0,0 +1,124 @@
+import asyncio
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+import src.errors as errors
+from src.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_SHED
+
+ROUTE_CLASSES = ("read", "write", "parser", "graphql")
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# scrapes and docs must keep working while the API sheds load
+EXEMPT_PATHS = {"/metrics", "/docs", "/redoc", "/openapi.json"}
+
+
+def route_class(scope: Scope) -> str:
+    path = scope["path"]
+    if path.startswith("/parser"):
+        return "parser"
+    if path.startswith("/graphql"):
+        return "graphql"
+    return "read" if scope["method"] in READ_METHODS else "write"
+
+
+class Slots:
+    """A fixed number of concurrently held slots."""
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+
+    async def acquire(self, timeout: float) -> bool:
+        # an unlocked semaphore is taken without suspending, so a zero timeout still admits on a free slot
+        if not self.semaphore.locked():
+            await self.semaphore.acquire()
+            return True
+        if timeout <= 0:
+            return False
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    def release(self) -> None:
+        self.semaphore.release()
+
+
+class AdmissionMiddleware:
+    """
+    Caps requests in flight across the app and per route class (reads, writes, `/parser`, `/graphql`).
+
+    A request that finds no free slot waits in a queue bounded by `queue_depth` for at most
+    `queue_timeout` seconds; when the queue is full or the wait runs out it is answered with
+    `503` and `Retry-After` right away, so overload costs a few fast failures instead of
+    latency for everyone.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        global_limit: int,
+        class_limits: dict[str, int],
+        queue_depth: int,
+        queue_timeout: float,
+        retry_after: int,
+    ):
+        self.app = app
+        self.global_slots = Slots(global_limit)
+        self.class_slots = {name: Slots(limit) for name, limit in class_limits.items()}
+        self.queued = dict.fromkeys(ROUTE_CLASSES, 0)
+        self.queue_depth = queue_depth
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+    async def acquire(self, slots: Slots | None, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        if slots is not None and not await slots.acquire(timeout):
+            return False
+        if not await self.global_slots.acquire(deadline - loop.time()):
+            if slots is not None:
+                slots.release()
+            return False
+        return True
+
+    async def admit(self, name: str, slots: Slots | None) -> str | None:
+        # returns why the request is shed, or None once it holds its slots
+        if await self.acquire(slots, 0):
+            return None
+        if self.queued[name] >= self.queue_depth:
+            return "queue_full"
+
+        self.queued[name] += 1
+        ADMISSION_QUEUE_DEPTH.labels(route_class=name).inc()
+        try:
+            return None if await self.acquire(slots, self.queue_timeout) else "timeout"
+        finally:
+            self.queued[name] -= 1
+            ADMISSION_QUEUE_DEPTH.labels(route_class=name).dec()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        name = route_class(scope)
+        slots = self.class_slots.get(name)
+
+        reason = await self.admit(name, slots)
+        if reason is not None:
+            ADMISSION_SHED.labels(route_class=name, reason=reason).inc()
+            exc = errors.OverloadedException(detail="Server is overloaded, retry later.", retry_after=self.retry_after)
+            await exc.json()(scope, receive, send)
+            return
+
+        ADMISSION_IN_FLIGHT.labels(route_class=name).inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            ADMISSION_IN_FLIGHT.labels(route_class=name).dec()
+            self.global_slots.release()
+            if slots is not None:
+                slots.release()
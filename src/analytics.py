@@ -0,0 +1,139 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    DateTime,
+    Select,
+    case,
+    cast,
+    func,
+    literal_column,
+)
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.schemas.analytics import (
+    BalancePoint,
+    DailyBalance,
+    Period,
+    SpendingGroup,
+    SpendingRow,
+)
+from src.schemas.categories import Category, CategoryType
+from src.schemas.transactions import Transaction, TransactionTagLink
+
+# SQLite has no `date_trunc`; weeks start on Monday as in PostgreSQL
+SQLITE_BUCKETS = {
+    Period.day: lambda date: func.date(date),
+    Period.week: lambda date: func.date(date, "weekday 0", "-6 days"),
+    Period.month: lambda date: func.strftime("%Y-%m-01", date),
+}
+
+
+def bucket_column(dialect: str, period: Period, column: ColumnElement = Transaction.date) -> ColumnElement:
+    if dialect == "postgresql":
+        if isinstance(column.type, Date):
+            # `date_trunc` of a date is a `timestamptz`: truncate a plain timestamp, so buckets stay naive
+            column = cast(column, DateTime)
+        # inlined rather than bound: the GROUP BY expression has to match the selected one exactly
+        return func.date_trunc(literal_column(f"'{period.value}'"), column)
+    return SQLITE_BUCKETS[period](column)
+
+
+def spending_query(
+    dialect: str,
+    user_id: int,
+    group_by: list[SpendingGroup],
+    period: Period | None,
+    date_from: datetime | None,
+    date_to: datetime | None,
+    category_type: CategoryType | None,
+) -> Select:
+    keys: list[ColumnElement] = []
+    if period is not None:
+        keys.append(bucket_column(dialect, period).label("bucket"))
+    if SpendingGroup.category in group_by:
+        keys.append(Transaction.category_id.label("category_id"))
+    if SpendingGroup.category_type in group_by:
+        keys.append(Category.type.label("category_type"))
+    if SpendingGroup.tag in group_by:
+        keys.append(TransactionTagLink.tag_id.label("tag_id"))
+
+    query = select(
+        *keys,
+        func.sum(Transaction.amount).label("total"),
+        func.count(Transaction.id).label("count"),
+        func.round(func.avg(Transaction.amount), 2).label("average"),
+    ).where(Transaction.user_id == user_id)
+
+    if SpendingGroup.category_type in group_by or category_type is not None:
+        query = query.join(Category, Category.id == Transaction.category_id)
+    if SpendingGroup.tag in group_by:
+        # a transaction counts once per tag, untagged ones fall into the `tag_id = null` group
+        query = query.outerjoin(TransactionTagLink, TransactionTagLink.transaction_id == Transaction.id)
+
+    if category_type is not None:
+        query = query.where(Category.type == category_type)
+    if date_from is not None:
+        query = query.where(Transaction.date >= date_from)
+    if date_to is not None:
+        query = query.where(Transaction.date <= date_to)
+
+    return query.group_by(*keys).order_by(*keys)
+
+
+async def spending(
+    session: AsyncSession,
+    user_id: int,
+    group_by: list[SpendingGroup],
+    period: Period | None,
+    date_from: datetime | None,
+    date_to: datetime | None,
+    category_type: CategoryType | None,
+) -> list[SpendingRow]:
+    query = spending_query(session.bind.dialect.name, user_id, group_by, period, date_from, date_to, category_type)
+    result = await session.execute(query)
+    return [SpendingRow.model_validate(row, from_attributes=True) for row in result]
+
+
+def signed_sum(category_type: CategoryType) -> ColumnElement:
+    return func.coalesce(func.sum(case((Category.type == category_type, DailyBalance.amount), else_=0)), 0)
+
+
+async def balance(
+    session: AsyncSession,
+    user_id: int,
+    period: Period,
+    date_from: date | None,
+    date_to: date | None,
+) -> list[BalancePoint]:
+    # both queries read the pre-aggregated `daily_balance` rows, never the transactions themselves
+    income, expense = signed_sum(CategoryType.income), signed_sum(CategoryType.expense)
+
+    opening = Decimal(0)
+    if date_from is not None:
+        query = (
+            select(income, expense)
+            .join_from(DailyBalance, Category)
+            .where(DailyBalance.user_id == user_id, DailyBalance.day < date_from)
+        )
+        opening_income, opening_expense = (await session.execute(query)).one()
+        opening = Decimal(opening_income) - Decimal(opening_expense)
+
+    bucket = bucket_column(session.bind.dialect.name, period, DailyBalance.day).label("bucket")
+    query = select(bucket, income, expense).join_from(DailyBalance, Category).where(DailyBalance.user_id == user_id)
+    if date_from is not None:
+        query = query.where(DailyBalance.day >= date_from)
+    if date_to is not None:
+        query = query.where(DailyBalance.day <= date_to)
+
+    points, running = [], opening
+    for bucket_start, bucket_income, bucket_expense in await session.execute(query.group_by(bucket).order_by(bucket)):
+        net = Decimal(bucket_income) - Decimal(bucket_expense)
+        running += net
+        points.append(
+            BalancePoint(bucket=bucket_start, income=bucket_income, expense=bucket_expense, net=net, balance=running)
+        )
+    return points
@@ -3,10 +3,12 @@ from fastapi import FastAPI
 import src.errors as errors
 from src.config import cfg
 from src.routers import (
+    analytics,
     auth,
     budgets,
     categories,
     goals,
+    search,
     tags,
     transactions,
     users,
@@ -22,6 +24,8 @@ routers = [
     transactions.router,
     budgets.router,
     goals.router,
+    search.router,
+    analytics.router,
 ]
 
 # === Errors To Handlers Map ===
@@ -53,9 +57,35 @@ def init() -> FastAPI:
     for exc, handler in exceptions.items():
         new_app.add_exception_handler(exc, handler)
 
+    if cfg.query_stats.enabled:
+        from src import db, query_stats
+
+        query_stats.instrument_engine(db.async_engine)
+        new_app.add_middleware(
+            query_stats.QueryStatsMiddleware,
+            server_timing=cfg.query_stats.server_timing,
+            repeat_threshold=cfg.query_stats.repeat_threshold,
+        )
+
+    if cfg.admission.enabled:
+        from src.admission import AdmissionMiddleware
+
+        # added before the instrumentator so that shed requests still show up in its metrics
+        new_app.add_middleware(
+            AdmissionMiddleware,
+            global_limit=cfg.admission.global_limit,
+            class_limits=cfg.admission.class_limits,
+            queue_depth=cfg.admission.queue_depth,
+            queue_timeout=cfg.admission.queue_timeout,
+            retry_after=cfg.admission.retry_after,
+        )
+
     if cfg.prometheus.monitor:
         from prometheus_fastapi_instrumentator import Instrumentator
 
+        from src import db, metrics
+
+        metrics.instrument_db_pool(db.async_engine)
         Instrumentator().instrument(new_app).expose(new_app)
 
     return new_app
@@ -1,14 +1,16 @@
 import datetime
 
 import jwt
-from fastapi import Security
+from fastapi import Depends, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from passlib.context import CryptContext
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.cache import principal_cache
 from src.config import cfg
-from src.db import find_user
+from src.db import find_user, get_session
 from src.errors import AuthorizationException
-from src.schemas.users import User
+from src.schemas.users import UserPrincipal
 
 
 class AuthHandler:
@@ -39,16 +41,28 @@ class AuthHandler:
         except jwt.InvalidTokenError:
             raise AuthorizationException(detail="Invalid token")
 
-    def get_current_user(self, creds: HTTPAuthorizationCredentials = Security(security)) -> User | None:
+    async def get_current_user(
+        self,
+        creds: HTTPAuthorizationCredentials = Security(security),
+        session: AsyncSession = Depends(get_session),
+    ) -> UserPrincipal:
         email = self.decode_token(creds.credentials)
         if email is None:
             raise AuthorizationException(detail="Could not validate credentials")
 
-        user = find_user(email)
+        # the principal only authenticates the request: it is never part of the session, so handlers
+        # reading the user row still load it, fresh, even when the principal comes from the cache
+        cached = await principal_cache.get(email)
+        if cached is not None:
+            return UserPrincipal.model_validate(cached)
+
+        user = await find_user(session, email)
         if user is None:
             raise AuthorizationException(detail="User is not found")
 
-        return user
+        principal = UserPrincipal.model_validate(user)
+        await principal_cache.set(email, principal.model_dump(mode="json"))
+        return principal
 
 
 auth = AuthHandler()
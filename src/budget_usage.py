@@ -0,0 +1,81 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    ColumnElement,
+    Insert,
+    Select,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import src.db as db
+from src.schemas.budgets import Budget, BudgetUsage
+from src.schemas.transactions import Transaction, TransactionDefault
+
+
+def covering_budgets(transaction: TransactionDefault) -> Select:
+    return select(Budget.id).where(
+        Budget.user_id == transaction.user_id,
+        Budget.category_id == transaction.category_id,
+        Budget.start_date <= transaction.date,
+        Budget.end_date >= transaction.date,
+    )
+
+
+async def track(session: AsyncSession, transaction: TransactionDefault, sign: int = 1) -> None:
+    # one atomic increment of the counters of every budget the transaction falls into; pass `sign=-1` to undo
+    await session.execute(
+        update(BudgetUsage)
+        .where(BudgetUsage.budget_id.in_(covering_budgets(transaction)))
+        .values(
+            spent=BudgetUsage.spent + sign * transaction.amount,
+            transaction_count=BudgetUsage.transaction_count + sign,
+            updated_at=datetime.utcnow(),
+        )
+    )
+
+
+def recompute_statement(dialect: str, condition: ColumnElement = true()) -> Insert:
+    """Upsert the usage of the matching budgets from scratch; only rows that actually change are written."""
+    totals = (
+        select(
+            Budget.id,
+            func.coalesce(func.sum(Transaction.amount), 0),
+            func.count(Transaction.id),
+            literal(datetime.utcnow()),
+        )
+        .outerjoin(
+            Transaction,
+            (Transaction.user_id == Budget.user_id)
+            & (Transaction.category_id == Budget.category_id)
+            & (Transaction.date >= Budget.start_date)
+            & (Transaction.date <= Budget.end_date),
+        )
+        .where(condition)
+        .group_by(Budget.id)
+    )
+
+    statement = db.dialect_insert(dialect, BudgetUsage).from_select(
+        ["budget_id", "spent", "transaction_count", "updated_at"], totals
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[BudgetUsage.budget_id],
+        set_={
+            "spent": statement.excluded.spent,
+            "transaction_count": statement.excluded.transaction_count,
+            "updated_at": statement.excluded.updated_at,
+        },
+        where=or_(
+            BudgetUsage.spent != statement.excluded.spent,
+            BudgetUsage.transaction_count != statement.excluded.transaction_count,
+        ),
+    )
+
+
+async def recompute(session: AsyncSession, condition: ColumnElement) -> None:
+    await session.execute(recompute_statement(session.bind.dialect.name, condition))
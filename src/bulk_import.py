@@ -0,0 +1,210 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import Any, Iterator
+
+from fastapi import UploadFile
+from pydantic import ValidationError
+from sqlalchemy import insert, text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import iterate_in_threadpool
+
+import src.budget_usage as budget_usage
+import src.daily_balance as daily_balance
+import src.etag as etag
+from src.errors import BadRequestException
+from src.schemas.budgets import Budget
+from src.schemas.categories import Category
+from src.schemas.tags import Tag
+from src.schemas.transactions import (
+    INVALID_TEXT,
+    FileFormat,
+    ImportResult,
+    ImportRowError,
+    Transaction,
+    TransactionImportRow,
+    TransactionTagLink,
+)
+
+IMPORT_BATCH_SIZE = 5000
+
+STAGING_TABLE = "transaction_import"
+
+# ids are drawn from the `transaction` sequence while copying, so tag links can be inserted set-based
+CREATE_STAGING_TABLE = f"""
+CREATE TEMP TABLE {STAGING_TABLE} (
+    id integer NOT NULL DEFAULT nextval(pg_get_serial_sequence('transaction', 'id')),
+    row_no integer NOT NULL,
+    user_id integer NOT NULL,
+    category_id integer NOT NULL,
+    amount numeric(10, 2) NOT NULL,
+    date timestamp NOT NULL,
+    description text,
+    tag_ids integer[] NOT NULL
+) ON COMMIT DROP
+"""
+
+STAGING_COLUMNS = ["row_no", "user_id", "category_id", "amount", "date", "description", "tag_ids"]
+
+INSERT_TRANSACTIONS = f"""
+INSERT INTO transaction (id, user_id, category_id, amount, date, description)
+SELECT id, user_id, category_id, amount, date, description FROM {STAGING_TABLE} ORDER BY row_no
+"""
+
+INSERT_TAG_LINKS = f"""
+INSERT INTO transaction_tag (transaction_id, tag_id)
+SELECT id, unnest(tag_ids) FROM {STAGING_TABLE}
+"""
+
+Batch = list[tuple[int, TransactionImportRow]]
+
+
+def iter_raw_rows(file: UploadFile, fmt: FileFormat) -> Iterator[tuple[int, Any]]:
+    # bytes that are not UTF-8 are kept as lone surrogates instead of failing the whole upload,
+    # `TransactionImportRow` reports the rows holding them
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="surrogateescape", newline="")
+
+    if fmt is FileFormat.csv:
+        yield from iter_csv_rows(csv.DictReader(stream))
+        return
+
+    for row_no, line in enumerate(stream, start=1):
+        if line.strip():
+            yield row_no, line
+
+
+def iter_csv_rows(reader: csv.DictReader) -> Iterator[tuple[int, Any]]:
+    try:
+        header = reader.fieldnames or []
+    except csv.Error as exc:
+        raise BadRequestException(detail=f"Malformed CSV header: {exc}")
+    if INVALID_TEXT.search("".join(header)):
+        raise BadRequestException(detail="The CSV header must be UTF-8 text without NUL characters")
+
+    row_no = 0
+    while True:
+        row_no += 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            # the reader goes on with the next record, the broken one is reported
+            yield row_no, exc
+            continue
+
+        row["description"] = row.get("description") or None
+        row["tag_ids"] = [tag_id for tag_id in (row.get("tag_ids") or "").split(";") if tag_id]
+        yield row_no, row
+
+
+def iter_batches(rows: Iterator[tuple[int, Any]]) -> Iterator[list[tuple[int, Any]]]:
+    while batch := list(islice(rows, IMPORT_BATCH_SIZE)):
+        yield batch
+
+
+def validate(raw_rows: list[tuple[int, Any]], errors: list[ImportRowError]) -> Batch:
+    rows = []
+    for row_no, raw in raw_rows:
+        try:
+            if isinstance(raw, csv.Error):
+                raise raw
+            if isinstance(raw, str):
+                rows.append((row_no, TransactionImportRow.model_validate(json.loads(raw))))
+            else:
+                rows.append((row_no, TransactionImportRow.model_validate(raw)))
+        except (ValueError, csv.Error) as exc:
+            errors.append(ImportRowError(row=row_no, detail=describe(exc)))
+    return rows
+
+
+def describe(exc: ValueError | csv.Error) -> str:
+    if isinstance(exc, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in exc.errors())
+    return f"Malformed row: {exc}"
+
+
+async def resolve_references(session: AsyncSession, rows: Batch, errors: list[ImportRowError]) -> Batch:
+    # one lookup per batch for all referenced categories and tags; missing tags are skipped like on create
+    if not rows:
+        return rows
+
+    category_ids = {row.category_id for _, row in rows}
+    tag_ids = {tag_id for _, row in rows for tag_id in row.tag_ids}
+
+    known_categories = set((await session.exec(select(Category.id).where(Category.id.in_(category_ids)))).all())
+    known_tags = set((await session.exec(select(Tag.id).where(Tag.id.in_(tag_ids)))).all()) if tag_ids else set()
+
+    resolved = []
+    for row_no, row in rows:
+        if row.category_id not in known_categories:
+            errors.append(ImportRowError(row=row_no, detail=f"Category <{row.category_id}> not found."))
+            continue
+        row.tag_ids = sorted(set(row.tag_ids) & known_tags)
+        resolved.append((row_no, row))
+    return resolved
+
+
+async def copy_batch(session: AsyncSession, user_id: int, rows: Batch) -> None:
+    await session.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        STAGING_TABLE,
+        records=[
+            (row_no, user_id, row.category_id, row.amount, row.date, row.description, row.tag_ids)
+            for row_no, row in rows
+        ],
+        columns=STAGING_COLUMNS,
+    )
+
+    await session.execute(text(INSERT_TRANSACTIONS))
+    await session.execute(text(INSERT_TAG_LINKS))
+
+
+async def insert_batch(session: AsyncSession, user_id: int, rows: Batch) -> None:
+    # portable path for databases without COPY
+    result = await session.execute(
+        insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+        [{**row.model_dump(exclude={"tag_ids"}), "user_id": user_id} for _, row in rows],
+    )
+    links = [
+        {"transaction_id": transaction_id, "tag_id": tag_id}
+        for transaction_id, (_, row) in zip(result.scalars().all(), rows)
+        for tag_id in row.tag_ids
+    ]
+    if links:
+        await session.execute(insert(TransactionTagLink), links)
+
+
+async def import_transactions(session: AsyncSession, user_id: int, file: UploadFile, fmt: FileFormat) -> ImportResult:
+    use_copy = session.bind.dialect.name == "postgresql"
+    if use_copy:
+        await session.execute(text(CREATE_STAGING_TABLE))
+
+    errors: list[ImportRowError] = []
+    imported = 0
+
+    # reading the upload (spooled to disk past 1 MB) and validating its rows is blocking work,
+    # so every batch is parsed in the threadpool and only the database work runs on the event loop
+    batches = (validate(raw_rows, errors) for raw_rows in iter_batches(iter_raw_rows(file, fmt)))
+    async for valid_rows in iterate_in_threadpool(batches):
+        rows = await resolve_references(session, valid_rows, errors)
+        if not rows:
+            continue
+
+        await (copy_batch if use_copy else insert_batch)(session, user_id, rows)
+        imported += len(rows)
+
+    # one set-based recount instead of per-row counter updates
+    if imported:
+        await budget_usage.recompute(session, Budget.user_id == user_id)
+        await daily_balance.recompute(session, Transaction.user_id == user_id)
+        await etag.bump(session, "transactions", user_id)
+    await session.commit()
+
+    errors.sort(key=lambda error: error.row)
+    return ImportResult(imported=imported, errors=errors)
@@ -0,0 +1,67 @@
+import json
+import logging
+
+from cachetools import TTLCache
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import cfg
+from src.metrics import PRINCIPAL_CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+redis_client: Redis | None = Redis.from_url(cfg.redis.url) if cfg.redis.url else None
+
+
+class PrincipalCache:
+    """
+    Cache of authenticated users: in Redis, shared across workers, when it is configured, else in-process LRU+TTL.
+
+    The in-process tier is not used next to Redis: an invalidation could not reach the copies held by other
+    workers, which would keep serving an updated or deleted user until the entry expires.
+    """
+
+    prefix = "principal:"
+
+    def __init__(self, maxsize: int, ttl: int, redis: Redis | None = None):
+        self.ttl = ttl
+        self.redis = redis
+        self.local: TTLCache[str, dict] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, subject: str) -> dict | None:
+        if self.redis is None:
+            data = self.local.get(subject)
+            PRINCIPAL_CACHE_REQUESTS.labels(tier="memory", result="miss" if data is None else "hit").inc()
+            return data
+
+        try:
+            raw = await self.redis.get(self.prefix + subject)
+        except RedisError as exc:
+            logger.warning("principal cache: redis lookup failed: %s", exc)
+            return None
+
+        PRINCIPAL_CACHE_REQUESTS.labels(tier="redis", result="miss" if raw is None else "hit").inc()
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, subject: str, data: dict) -> None:
+        if self.redis is None:
+            self.local[subject] = data
+            return
+
+        try:
+            await self.redis.set(self.prefix + subject, json.dumps(data), ex=self.ttl)
+        except RedisError as exc:
+            logger.warning("principal cache: redis write failed: %s", exc)
+
+    async def invalidate(self, subject: str) -> None:
+        if self.redis is None:
+            self.local.pop(subject, None)
+            return
+
+        try:
+            await self.redis.delete(self.prefix + subject)
+        except RedisError as exc:
+            logger.warning("principal cache: redis invalidation failed: %s", exc)
+
+
+principal_cache = PrincipalCache(maxsize=cfg.auth.cache_size, ttl=cfg.auth.cache_ttl, redis=redis_client)
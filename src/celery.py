@@ -1,10 +1,23 @@
 import requests
+from sqlmodel import create_engine
 
+import src.budget_usage as budget_usage
+import src.daily_balance as daily_balance
 import src.errors as errors
 from celery import Celery
 from src.config import cfg
 
 celery_app = Celery("worker", broker=cfg.parser.celery_broker_url, backend=cfg.parser.celery_backend_url)
+celery_app.conf.beat_schedule = {
+    "reconcile-budget-usage": {
+        "task": "src.celery.reconcile_budget_usage_task",
+        "schedule": cfg.budget.reconcile_interval,
+    },
+    "reconcile-daily-balance": {
+        "task": "src.celery.reconcile_daily_balance_task",
+        "schedule": cfg.analytics.balance_reconcile_interval,
+    },
+}
 
 
 @celery_app.task
@@ -18,3 +31,29 @@ def parse_url_task(count: int) -> dict:
         raise errors.BadRequestException(detail=f"Request error: {str(e)}")
     except ValueError:
         raise errors.BadRequestException(detail="Invalid JSON response from parser service")
+
+
+@celery_app.task
+def reconcile_budget_usage_task() -> dict:
+    # counters are kept up to date by the API; this recount repairs drift from writes that bypass it
+    engine = create_engine(cfg.db.url)
+    try:
+        with engine.begin() as connection:
+            result = connection.execute(budget_usage.recompute_statement(connection.dialect.name))
+    finally:
+        engine.dispose()
+
+    return {"repaired": result.rowcount}
+
+
+@celery_app.task
+def reconcile_daily_balance_task() -> dict:
+    engine = create_engine(cfg.db.url)
+    try:
+        with engine.begin() as connection:
+            repaired = connection.execute(daily_balance.recompute_statement(connection.dialect.name)).rowcount
+            pruned = connection.execute(daily_balance.prune_statement(connection.dialect.name)).rowcount
+    finally:
+        engine.dispose()
+
+    return {"repaired": repaired, "pruned": pruned}
@@ -26,10 +26,28 @@ class DataBaseConfig(ConfigBase):
     name: str
     debug: bool = Field(False)
 
+    pool_size: int = Field(5)
+    pool_max_overflow: int = Field(10)
+    pool_timeout: float = Field(30.0)
+    pool_recycle: int = Field(1800)
+    pool_pre_ping: bool = Field(True)
+    statement_timeout: int = Field(0)  # milliseconds, 0 disables the limit
+
     @property
     def url(self) -> str:
         return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
 
+    @property
+    def async_url(self) -> str:
+        return self.url.replace("postgresql://", "postgresql+asyncpg://")
+
+
+class PaginationConfig(ConfigBase):
+    model_config = SettingsConfigDict(env_prefix="PAGINATION_")
+
+    default_size: int = Field(50)
+    max_size: int = Field(500)
+
 
 class PrometheusConfig(ConfigBase):
     model_config = SettingsConfigDict(env_prefix="PR_")
@@ -43,6 +61,82 @@ class AuthConfig(ConfigBase):
     secret: str
     alg: str = Field("HS256")
     ttl: int = Field(360)
+    # users held by the in-process principal cache, which is only used when REDIS_URL is not set
+    cache_size: int = Field(1024)
+    cache_ttl: int = Field(60)
+
+
+class BudgetConfig(ConfigBase):
+    model_config = SettingsConfigDict(env_prefix="BUDGET_")
+
+    # seconds between celery beat runs that repair drifted budget usage counters
+    reconcile_interval: int = Field(3600)
+
+
+class AnalyticsConfig(ConfigBase):
+    model_config = SettingsConfigDict(env_prefix="ANALYTICS_")
+
+    # seconds between celery beat runs that recount the daily balance table
+    balance_reconcile_interval: int = Field(86400)
+    # days of history behind the savings rate used by goal forecasts
+    forecast_window_days: int = Field(90)
+
+
+class CacheConfig(ConfigBase):
+    model_config = SettingsConfigDict(env_prefix="CACHE_")
+
+    enabled: bool = Field(False)
+    # seconds a cached response lives, by route name; routes missing here or set to 0 are not cached
+    route_ttls: dict[str, int] = Field(
+        default_factory=lambda: {
+            "get_category": 300,
+            "list_category": 60,
+            "get_tag": 300,
+            "list_tags": 60,
+            "get_budget": 300,
+            "list_budgets": 60,
+            "get_goal": 300,
+            "list_goals": 60,
+        }
+    )
+
+
+class QueryStatsConfig(ConfigBase):
+    model_config = SettingsConfigDict(env_prefix="QUERY_STATS_")
+
+    enabled: bool = Field(True)
+    # adds a `Server-Timing` header with the request's total and slowest SQL time
+    server_timing: bool = Field(False)
+    # a statement shape repeated more times than this in one request is logged as a likely N+1
+    repeat_threshold: int = Field(10)
+
+
+class AdmissionConfig(ConfigBase):
+    model_config = SettingsConfigDict(env_prefix="ADMISSION_")
+
+    enabled: bool = Field(True)
+    # requests served at once, across the app and by route class
+    global_limit: int = Field(64)
+    class_limits: dict[str, int] = Field(
+        default_factory=lambda: {
+            "read": 48,
+            "write": 16,
+            "parser": 4,
+            "graphql": 8,
+        }
+    )
+    # requests of one route class allowed to wait for a slot, the rest are shed at once
+    queue_depth: int = Field(64)
+    # seconds a queued request waits for its slots before it is shed
+    queue_timeout: float = Field(2.0)
+    # seconds sent in `Retry-After` of a shed request
+    retry_after: int = Field(1)
+
+
+class RedisConfig(ConfigBase):
+    model_config = SettingsConfigDict(env_prefix="REDIS_")
+
+    url: str | None = Field(None)
 
 
 class ParserConfig(ConfigBase):
@@ -59,13 +153,30 @@ class GraphQL(ConfigBase):
 
     enabled: bool = Field(False)
     url: str
+    # connections to the GraphQL service shared by all proxied requests, and how many of them stay open idle
+    max_connections: int = Field(100)
+    max_keepalive_connections: int = Field(20)
+    # seconds an idle connection is kept open for reuse
+    keepalive_expiry: float = Field(30.0)
+    # seconds to connect, to wait for a free connection, and between two chunks read or written
+    connect_timeout: float = Field(5.0)
+    pool_timeout: float = Field(5.0)
+    read_timeout: float = Field(30.0)
+    write_timeout: float = Field(30.0)
 
 
 class Config(ConfigBase):
     uvicorn: UvicornConfig = Field(default_factory=UvicornConfig)
     db: DataBaseConfig = Field(default_factory=DataBaseConfig)
     auth: AuthConfig = Field(default_factory=AuthConfig)
+    pagination: PaginationConfig = Field(default_factory=PaginationConfig)
+    budget: BudgetConfig = Field(default_factory=BudgetConfig)
+    analytics: AnalyticsConfig = Field(default_factory=AnalyticsConfig)
     prometheus: PrometheusConfig = Field(default_factory=PrometheusConfig)
+    redis: RedisConfig = Field(default_factory=RedisConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    admission: AdmissionConfig = Field(default_factory=AdmissionConfig)
+    query_stats: QueryStatsConfig = Field(default_factory=QueryStatsConfig)
     parser: ParserConfig = Field(default_factory=ParserConfig)
     graphql: GraphQL = Field(default_factory=GraphQL)
 
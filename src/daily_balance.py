@@ -0,0 +1,81 @@
+from sqlalchemy import (
+    ColumnElement,
+    Delete,
+    Insert,
+    delete,
+    exists,
+    func,
+    literal,
+    select,
+    true,
+)
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import src.db as db
+from src.schemas.analytics import DailyBalance
+from src.schemas.transactions import Transaction, TransactionDefault
+
+
+async def track(session: AsyncSession, transaction: TransactionDefault, sign: int = 1) -> None:
+    # rows are unsigned sums, the category type is applied when balances are read
+    statement = db.dialect_insert(session.bind.dialect.name, DailyBalance).values(
+        user_id=transaction.user_id,
+        day=transaction.date.date(),
+        category_id=transaction.category_id,
+        amount=sign * transaction.amount,
+        transaction_count=sign,
+    )
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[DailyBalance.user_id, DailyBalance.day, DailyBalance.category_id],
+            set_={
+                "amount": DailyBalance.amount + statement.excluded.amount,
+                "transaction_count": DailyBalance.transaction_count + statement.excluded.transaction_count,
+            },
+        )
+    )
+
+
+def recompute_statement(dialect: str, condition: ColumnElement = true()) -> Insert:
+    """Upsert the daily sums of the matching transactions from scratch, writing only rows that change."""
+    day = func.date(Transaction.date)
+    totals = (
+        select(
+            Transaction.user_id,
+            day,
+            Transaction.category_id,
+            func.sum(Transaction.amount),
+            func.count(Transaction.id),
+        )
+        .where(condition)
+        .group_by(Transaction.user_id, day, Transaction.category_id)
+    )
+
+    statement = db.dialect_insert(dialect, DailyBalance).from_select(
+        ["user_id", "day", "category_id", "amount", "transaction_count"], totals
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[DailyBalance.user_id, DailyBalance.day, DailyBalance.category_id],
+        set_={"amount": statement.excluded.amount, "transaction_count": statement.excluded.transaction_count},
+        where=(DailyBalance.amount != statement.excluded.amount)
+        | (DailyBalance.transaction_count != statement.excluded.transaction_count),
+    )
+
+
+def prune_statement(dialect: str) -> Delete:
+    """Drop days that no longer have any transactions."""
+    next_day = DailyBalance.day + 1 if dialect == "postgresql" else func.date(DailyBalance.day, "+1 day")
+    return delete(DailyBalance).where(
+        ~exists(
+            select(literal(1)).where(
+                Transaction.user_id == DailyBalance.user_id,
+                Transaction.category_id == DailyBalance.category_id,
+                Transaction.date >= DailyBalance.day,
+                Transaction.date < next_day,
+            )
+        )
+    )
+
+
+async def recompute(session: AsyncSession, condition: ColumnElement) -> None:
+    await session.execute(recompute_statement(session.bind.dialect.name, condition))
@@ -1,20 +1,110 @@
-from sqlmodel import Session, SQLModel, create_engine
+import time
+from typing import AsyncGenerator
+
+from sqlalchemy import ARRAY, Delete, Insert, Integer, any_, bindparam, delete, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+from sqlmodel import SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 
 from src.config import cfg
+from src.metrics import DB_POOL_CHECKOUT_WAIT
+from src.schemas.tags import Tag
+from src.schemas.transactions import TransactionTagLink
 from src.schemas.users import User
 
-engine = create_engine(cfg.db.url, echo=cfg.db.debug)
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that tracks pending checkouts and how long they wait for a connection."""
+
+    waiting: int = 0
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            return super().connect()
+        finally:
+            self.waiting -= 1
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+# ON CONFLICT clauses are only available on the dialect specific `insert` constructs
+DIALECT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+async_engine: AsyncEngine = create_async_engine(
+    cfg.db.async_url,
+    echo=cfg.db.debug,
+    poolclass=InstrumentedQueuePool,
+    pool_size=cfg.db.pool_size,
+    max_overflow=cfg.db.pool_max_overflow,
+    pool_timeout=cfg.db.pool_timeout,
+    pool_recycle=cfg.db.pool_recycle,
+    pool_pre_ping=cfg.db.pool_pre_ping,
+    connect_args={"server_settings": {"statement_timeout": str(cfg.db.statement_timeout)}},
+)
+
+async_session_factory = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
 
 
 def init() -> None:
+    # schema bootstrap runs once before the server starts, so a short-lived sync engine is enough here
+    engine = create_engine(cfg.db.url, echo=cfg.db.debug)
     SQLModel.metadata.create_all(engine)
+    engine.dispose()
+
+
+def dialect_insert(dialect: str, model: type[SQLModel]) -> Insert:
+    return DIALECT_INSERTS[dialect](model)
 
 
-def get_session() -> Session:
-    with Session(engine) as session:
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    # FastAPI caches dependencies per request, so the auth dependency and the route handler
+    # both receive this very session: one pool checkout and one identity map per request
+    async with async_session_factory() as session:
         yield session
 
 
-def find_user(email: str) -> User | None:
-    with Session(engine) as session:
-        return session.query(User).filter(User.email == email).first()
+def find_user_query(email: str) -> SelectOfScalar:
+    return select(User).where(User.email == email)
+
+
+async def find_user(session: AsyncSession, email: str) -> User | None:
+    result = await session.exec(find_user_query(email))
+    return result.first()
+
+
+async def find_tags(session: AsyncSession, tag_ids: list[int]) -> list[Tag]:
+    if not tag_ids:
+        return []
+
+    if session.bind.dialect.name == "postgresql":
+        # a single array parameter keeps one prepared statement for any number of ids
+        condition = Tag.id == any_(bindparam("tag_ids", sorted(set(tag_ids)), type_=ARRAY(Integer)))
+    else:
+        condition = Tag.id.in_(tag_ids)
+
+    result = await session.exec(select(Tag).where(condition).order_by(Tag.id))
+    return list(result.all())
+
+
+def unlink_tags_statement(transaction_id: int) -> Delete:
+    return delete(TransactionTagLink).where(TransactionTagLink.transaction_id == transaction_id)
+
+
+async def replace_transaction_tags(session: AsyncSession, transaction_id: int, tags: list[Tag]) -> None:
+    await session.execute(unlink_tags_statement(transaction_id))
+    if tags:
+        await session.execute(
+            insert(TransactionTagLink),
+            [{"transaction_id": transaction_id, "tag_id": tag.id} for tag in tags],
+        )
@@ -104,6 +104,29 @@ class BadRequestException(Exception):
         }
 
 
+class OverloadedException(Exception):
+    status: ClassVar[int] = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail: str
+
+    def __init__(self, detail: str, retry_after: int):
+        self.detail = detail
+        self.retry_after = retry_after
+
+    def json(self) -> JSONResponse:
+        return JSONResponse(
+            status_code=self.status, content={"detail": self.detail}, headers={"Retry-After": str(self.retry_after)}
+        )
+
+    @classmethod
+    def response(cls) -> dict[int, dict[str, Any]]:
+        return {
+            cls.status: {
+                "description": "Server overloaded, retry after the number of seconds in `Retry-After`",
+                "content": {"application/json": {"example": {"detail": "string"}}},
+            }
+        }
+
+
 # === Errors Handlers ===
 
 
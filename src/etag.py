@@ -0,0 +1,63 @@
+import hashlib
+from typing import Callable
+
+from fastapi import Depends, Query, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette import status
+
+import src.db as db
+from src.schemas.versions import CollectionVersion
+
+
+async def bump(session: AsyncSession, collection: str, user_id: int) -> None:
+    # runs inside the write's own transaction, so the version moves exactly when the data does
+    statement = db.dialect_insert(session.bind.dialect.name, CollectionVersion).values(
+        user_id=user_id, collection=collection, version=1
+    )
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[CollectionVersion.user_id, CollectionVersion.collection],
+            set_={"version": CollectionVersion.version + 1},
+        )
+    )
+
+
+def weak_match(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+class CollectionETag:
+    """ETag of a user's collection listing, derived from its version counter and the query string."""
+
+    def __init__(self, etag: str | None, if_none_match: str | None):
+        self.etag = etag
+        self.not_modified = etag is not None and weak_match(if_none_match, etag)
+
+    def not_modified_response(self) -> Response:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": self.etag})
+
+
+def collection_etag(collection: str) -> Callable:
+    # only listings scoped to one user carry an ETag, there is no version counter across users
+    async def dependency(
+        request: Request,
+        response: Response,
+        user_id: int | None = Query(None),
+        session: AsyncSession = Depends(db.get_session),
+    ) -> CollectionETag:
+        if user_id is None:
+            return CollectionETag(None, None)
+
+        counter = await session.get(CollectionVersion, (user_id, collection))
+        version = counter.version if counter is not None else 0
+        params = sorted(request.query_params.multi_items())
+        digest = hashlib.sha256(f"{collection}:{user_id}:{version}:{params}".encode()).hexdigest()[:32]
+
+        etag = f'W/"{digest}"'
+        response.headers["ETag"] = etag
+        return CollectionETag(etag, request.headers.get("If-None-Match"))
+
+    return dependency
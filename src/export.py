@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import Row, Select
+
+import src.db as db
+from src.schemas.transactions import FileFormat, Transaction
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = (
+    Transaction.id,
+    Transaction.user_id,
+    Transaction.category_id,
+    Transaction.amount,
+    Transaction.date,
+    Transaction.description,
+)
+
+MEDIA_TYPES = {
+    FileFormat.csv: "text/csv",
+    FileFormat.ndjson: "application/x-ndjson",
+}
+
+
+async def stream_partitions(statement: Select) -> AsyncIterator[Sequence[Row]]:
+    # the export outlives the request dependencies, so it owns its session; `yield_per` makes asyncpg
+    # read through a server-side cursor, keeping at most one batch of rows in memory
+    async with db.async_session_factory() as session:
+        result = await session.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            yield partition
+
+
+def row_values(row: Row) -> list:
+    return [
+        row.id,
+        row.user_id,
+        row.category_id,
+        str(row.amount),
+        row.date.isoformat(),
+        row.description,
+    ]
+
+
+async def encode_csv(partitions: AsyncIterator[Sequence[Row]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(column.key for column in EXPORT_COLUMNS)
+
+    async for partition in partitions:
+        writer.writerows(row_values(row) for row in partition)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def encode_ndjson(partitions: AsyncIterator[Sequence[Row]]) -> AsyncIterator[bytes]:
+    keys = [column.key for column in EXPORT_COLUMNS]
+    async for partition in partitions:
+        yield "".join(json.dumps(dict(zip(keys, row_values(row)))) + "\n" for row in partition).encode()
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_stream(statement: Select, fmt: FileFormat, compress: bool) -> AsyncIterator[bytes]:
+    encode = encode_csv if fmt is FileFormat.csv else encode_ndjson
+    chunks = encode(stream_partitions(statement))
+    return gzip_chunks(chunks) if compress else chunks
@@ -0,0 +1,102 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import BigInteger, ColumnElement, case, cast, func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import cfg
+from src.schemas.analytics import DailyBalance
+from src.schemas.categories import Category, CategoryType
+from src.schemas.goals import Goal, GoalForecast
+
+CENTS = 100
+# projections further out than this are reported as unreachable
+HORIZON_DAYS = 100 * 365
+
+SCORE_KEYS = ("remaining", "days_to_deadline", "reachable", "projected", "required", "on_track")
+
+
+def cents(amount: ColumnElement) -> ColumnElement:
+    # amounts leave the database as exact integers, numpy never sees a Decimal
+    return cast(func.round(amount * CENTS), BigInteger)
+
+
+def to_amount(value: float) -> Decimal:
+    return Decimal(int(round(value))).scaleb(-2)
+
+
+async def savings_rates(session: AsyncSession, user_ids: list[int], today: date) -> dict[int, float]:
+    """Average net savings per day in cents over the forecast window, from the pre-aggregated daily balances."""
+    window = cfg.analytics.forecast_window_days
+    signed = case((Category.type == CategoryType.income, DailyBalance.amount), else_=-DailyBalance.amount)
+    query = (
+        select(DailyBalance.user_id, cents(func.sum(signed)))
+        .join(Category)
+        .where(DailyBalance.user_id.in_(user_ids), DailyBalance.day > today - timedelta(days=window))
+        .group_by(DailyBalance.user_id)
+    )
+    return {user_id: net / window for user_id, net in await session.execute(query)}
+
+
+def score(
+    target: np.ndarray,
+    current: np.ndarray,
+    deadline: np.ndarray,
+    rate: np.ndarray,
+    today: np.datetime64,
+) -> dict[str, np.ndarray]:
+    """Project every goal at once: cents for amounts, cents per day for rates, `datetime64[D]` for dates."""
+    remaining = np.maximum(target - current, 0)
+    days_to_deadline = (deadline - today).astype(np.int64)
+
+    growing = (remaining > 0) & (rate > 0)
+    days_needed = np.zeros_like(remaining)
+    days_needed[growing] = np.minimum(np.ceil(remaining[growing] / rate[growing]), HORIZON_DAYS + 1)
+    reachable = ((remaining == 0) | growing) & (days_needed <= HORIZON_DAYS)
+
+    return {
+        "remaining": remaining,
+        "days_to_deadline": days_to_deadline,
+        "reachable": reachable,
+        "projected": today + days_needed.astype("timedelta64[D]"),
+        "required": remaining / np.maximum(days_to_deadline, 1),
+        "on_track": reachable & (days_needed <= days_to_deadline),
+    }
+
+
+async def forecast_goals(session: AsyncSession, *conditions: ColumnElement) -> list[GoalForecast]:
+    query = select(Goal.id, Goal.user_id, cents(Goal.target_amount), cents(Goal.current_amount), Goal.deadline)
+    rows = (await session.execute(query.where(*conditions).order_by(Goal.id))).all()
+    if not rows:
+        return []
+
+    goal_ids, user_ids, target, current, deadlines = zip(*rows)
+    today = datetime.utcnow().date()
+    rates = await savings_rates(session, sorted(set(user_ids)), today)
+
+    scores = score(
+        target=np.array(target, dtype=np.int64),
+        current=np.array(current, dtype=np.int64),
+        deadline=np.array([deadline.date() for deadline in deadlines], dtype="datetime64[D]"),
+        rate=np.array([rates.get(user_id, 0.0) for user_id in user_ids], dtype=np.float64),
+        today=np.datetime64(today, "D"),
+    )
+
+    return [
+        GoalForecast(
+            goal_id=goal_id,
+            remaining_amount=to_amount(remaining),
+            daily_savings_rate=to_amount(rates.get(user_id, 0.0)),
+            projected_completion=projected if reachable else None,
+            days_to_deadline=days_to_deadline,
+            required_daily_savings=to_amount(required),
+            on_track=on_track,
+        )
+        for goal_id, user_id, remaining, days_to_deadline, reachable, projected, required, on_track in zip(
+            goal_ids,
+            user_ids,
+            *(scores[key].tolist() for key in SCORE_KEYS),
+        )
+    ]
@@ -0,0 +1,117 @@
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# === Database Pool ===
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the database pool.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the database pool.",
+)
+
+DB_POOL_IDLE = Gauge(
+    "db_pool_idle_connections",
+    "Connections currently idle in the database pool.",
+)
+
+DB_POOL_WAITING = Gauge(
+    "db_pool_waiting_requests",
+    "Checkouts currently waiting for a database connection.",
+)
+
+
+def instrument_db_pool(engine: AsyncEngine) -> None:
+    # gauges are evaluated on scrape, so they always reflect the pool currently bound to the engine;
+    # binding again only replaces the functions, so the app may be initialised more than once
+    DB_POOL_CHECKED_OUT.set_function(lambda: engine.pool.checkedout())
+    DB_POOL_IDLE.set_function(lambda: engine.pool.checkedin())
+    DB_POOL_WAITING.set_function(lambda: engine.pool.waiting)
+
+
+# === Queries Per Request ===
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed while serving a request, by route template.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Total time spent in SQL statements while serving a request, by route template.",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+DB_SLOWEST_QUERY = Histogram(
+    "db_slowest_query_seconds",
+    "Duration of the slowest SQL statement of a request, by route template.",
+    ["route"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+# === Caches ===
+
+PRINCIPAL_CACHE_REQUESTS = Counter(
+    "principal_cache_requests_total",
+    "Principal cache lookups by tier and result.",
+    ["tier", "result"],
+)
+
+# hit ratio per route: rate(response_cache_requests_total{result="hit"}) / rate(response_cache_requests_total)
+RESPONSE_CACHE_REQUESTS = Counter(
+    "response_cache_requests_total",
+    "Response cache lookups by route and result.",
+    ["route", "result"],
+)
+
+RESPONSE_CACHE_INVALIDATIONS = Counter(
+    "response_cache_invalidations_total",
+    "Response cache invalidations by collection.",
+    ["tag"],
+)
+
+
+# === Admission Control ===
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight_requests",
+    "Requests currently admitted, by route class.",
+    ["route_class"],
+)
+
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queued_requests",
+    "Requests currently waiting for admission, by route class.",
+    ["route_class"],
+)
+
+ADMISSION_SHED = Counter(
+    "admission_shed_requests_total",
+    "Requests rejected with 503 by admission control, by route class and reason.",
+    ["route_class", "reason"],
+)
+
+
+# === GraphQL Proxy ===
+
+GRAPHQL_UPSTREAM_LATENCY = Histogram(
+    "graphql_upstream_latency_seconds",
+    "Time until the GraphQL service answered with response headers, by method.",
+    ["method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+GRAPHQL_UPSTREAM_ERRORS = Counter(
+    "graphql_upstream_errors_total",
+    "Proxied GraphQL requests that failed or got a 5xx from the GraphQL service, by reason.",
+    ["reason"],
+)
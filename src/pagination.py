@@ -0,0 +1,99 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Sequence
+
+from fastapi import Query
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+import src.errors as errors
+from src.config import cfg
+from src.schemas.pagination import Page, PageParams
+
+
+def page_params(
+    cursor: str | None = Query(None, description="Opaque cursor returned as `next_cursor` by the previous page"),
+    limit: int = Query(cfg.pagination.default_size, ge=1, le=cfg.pagination.max_size, description="Page size"),
+) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def encode_cursor(values: tuple[Any, ...]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, keys: tuple[InstrumentedAttribute, ...]) -> tuple[Any, ...]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match the page keys")
+        return tuple(
+            datetime.fromisoformat(value) if key.type.python_type is datetime else key.type.python_type(value)
+            for key, value in zip(keys, values)
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise errors.BadRequestException(detail="Invalid pagination cursor")
+
+
+def page_query(
+    query: Select | SelectOfScalar,
+    keys: tuple[InstrumentedAttribute, ...],
+    page: PageParams,
+    descending: bool = False,
+) -> Select | SelectOfScalar:
+    # keyset pagination: seek past the last seen key instead of OFFSET, so every page costs the same
+    if page.cursor is not None:
+        row, last_seen = tuple_(*keys), tuple_(*decode_cursor(page.cursor, keys))
+        query = query.where(row < last_seen if descending else row > last_seen)
+
+    # one row past the page tells whether there is a next one
+    return query.order_by(*(key.desc() if descending else key for key in keys)).limit(page.limit + 1)
+
+
+async def fetch_page(
+    session: AsyncSession,
+    query: Select | SelectOfScalar,
+    keys: tuple[InstrumentedAttribute, ...],
+    page: PageParams,
+    descending: bool = False,
+) -> tuple[Sequence[Any], str | None]:
+    items = (await session.exec(page_query(query, keys, page, descending))).all()
+
+    next_cursor = None
+    if len(items) > page.limit:
+        items = items[: page.limit]
+        next_cursor = encode_cursor(tuple(getattr(items[-1], key.key) for key in keys))
+
+    return items, next_cursor
+
+
+async def paginate(
+    session: AsyncSession,
+    query: SelectOfScalar,
+    keys: tuple[InstrumentedAttribute, ...],
+    page: PageParams,
+    descending: bool = False,
+) -> Page:
+    items, next_cursor = await fetch_page(session, query, keys, page, descending)
+    return Page(items=items, next_cursor=next_cursor)
+
+
+async def paginate_rows(
+    session: AsyncSession,
+    query: Select,
+    keys: tuple[InstrumentedAttribute, ...],
+    page: PageParams,
+    descending: bool = False,
+) -> dict[str, Any]:
+    """
+    Same page as `paginate`, but built from plain column tuples: no ORM instances are loaded and no
+    response model is validated, the result is ready for `src.serialization.FastJSONResponse`.
+    """
+    rows, next_cursor = await fetch_page(session, query, keys, page, descending)
+    names = list(query.selected_columns.keys())
+    return {"items": [dict(zip(names, row)) for row in rows], "next_cursor": next_cursor}
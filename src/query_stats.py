@@ -0,0 +1,132 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.metrics import DB_QUERIES_PER_REQUEST, DB_SLOWEST_QUERY, DB_TIME_PER_REQUEST
+
+logger = logging.getLogger(__name__)
+
+# expanded IN lists and multi-row VALUES differ only in their number of placeholders
+PLACEHOLDERS = re.compile(r"(\$\d+|\?|%\(\w+\)s)(\s*,\s*(\$\d+|\?|%\(\w+\)s))*")
+
+
+def statement_shape(statement: str) -> str:
+    return PLACEHOLDERS.sub("?", " ".join(statement.split()))
+
+
+class QueryStats:
+    """SQL statements run on behalf of one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = 0.0
+        self.slowest_statement: str | None = None
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        self.shapes[statement_shape(statement)] += 1
+        if elapsed >= self.slowest:
+            self.slowest, self.slowest_statement = elapsed, statement
+
+    def server_timing(self) -> str:
+        total, slowest = self.duration * 1000, self.slowest * 1000
+        return f'db;dur={total:.1f};desc="{self.count} queries", db-slowest;dur={slowest:.1f}'
+
+
+# set by `QueryStatsMiddleware`; SQLAlchemy runs the sync engine events in greenlets sharing the caller's context
+current_stats: ContextVar[QueryStats | None] = ContextVar("current_stats", default=None)
+
+
+def before_cursor_execute(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, context: ExecutionContext, executemany: bool
+) -> None:
+    context.query_stats_started = time.perf_counter()
+
+
+def after_cursor_execute(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, context: ExecutionContext, executemany: bool
+) -> None:
+    stats = current_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - context.query_stats_started)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "after_cursor_execute", after_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    Counts and times the SQL statements of every request and reports them by route template.
+
+    Optionally adds a `Server-Timing` header, and logs a warning when one statement shape runs
+    more than `repeat_threshold` times in a request: the usual trace of an N+1 query.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool, repeat_threshold: int):
+        self.app = app
+        self.server_timing = server_timing
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            # headers leave with the response start, so the timing covers the statements run up to it
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing if self.server_timing else send)
+        finally:
+            current_stats.reset(token)
+            self.report(scope, stats)
+
+    def report(self, scope: Scope, stats: QueryStats) -> None:
+        route = scope.get("route")
+        template = route.path if route is not None else "unmatched"
+
+        DB_QUERIES_PER_REQUEST.labels(route=template).observe(stats.count)
+        DB_TIME_PER_REQUEST.labels(route=template).observe(stats.duration)
+        if stats.count:
+            DB_SLOWEST_QUERY.labels(route=template).observe(stats.slowest)
+            logger.debug(
+                "%s %s: %d queries in %.1f ms, slowest %.1f ms: %s",
+                scope["method"],
+                template,
+                stats.count,
+                stats.duration * 1000,
+                stats.slowest * 1000,
+                stats.slowest_statement,
+            )
+
+        for shape, repeats in stats.shapes.items():
+            if repeats > self.repeat_threshold:
+                logger.warning(
+                    "possible N+1: %s %s ran the same statement %d times: %s",
+                    scope["method"],
+                    template,
+                    repeats,
+                    shape,
+                )
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import logging
+from typing import Any, Callable
+
+from fastapi import Depends, Request, Response
+from fastapi.encoders import jsonable_encoder
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.auth import auth
+from src.cache import redis_client
+from src.config import cfg
+from src.metrics import RESPONSE_CACHE_INVALIDATIONS, RESPONSE_CACHE_REQUESTS
+from src.schemas.users import UserPrincipal
+
+logger = logging.getLogger(__name__)
+
+
+def scope(collection: str, user_id: int | None) -> str:
+    # the tag of cached reads of one user's rows, or of the listings spanning users when `user_id` is None
+    return collection if user_id is None else f"{collection}:{user_id}"
+
+
+class ResponseCache:
+    """Serialized GET responses in Redis, grouped by collection and owner so that writes can drop them."""
+
+    prefix = "response:"
+    tag_prefix = "response-tag:"
+
+    def __init__(self, redis: Redis | None, route_ttls: dict[str, int], enabled: bool = True):
+        self.redis = redis if enabled else None
+        self.route_ttls = route_ttls
+        self.max_ttl = max(route_ttls.values(), default=0)
+
+    def ttl(self, route: str) -> int:
+        return self.route_ttls.get(route, 0) if self.redis is not None else 0
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self.redis.get(self.prefix + key)
+        except RedisError as exc:
+            logger.warning("response cache: redis lookup failed: %s", exc)
+            return None
+
+    async def set(self, tag: str, key: str, body: bytes, ttl: int) -> None:
+        tag_key = self.tag_prefix + tag
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.set(self.prefix + key, body, ex=ttl)
+                pipe.sadd(tag_key, key)
+                # the tag set must outlive every entry it lists
+                pipe.expire(tag_key, self.max_ttl)
+                await pipe.execute()
+        except RedisError as exc:
+            logger.warning("response cache: redis write failed: %s", exc)
+
+    async def invalidate(self, collection: str, user_id: int) -> None:
+        """Drops the cached reads of one user's rows of a collection, and the listings spanning users."""
+        if self.redis is None:
+            return
+
+        RESPONSE_CACHE_INVALIDATIONS.labels(tag=collection).inc()
+        for tag in (scope(collection, user_id), scope(collection, None)):
+            tag_key = self.tag_prefix + tag
+            try:
+                keys = await self.redis.smembers(tag_key)
+                await self.redis.delete(tag_key, *(self.prefix + key.decode() for key in keys))
+            except RedisError as exc:
+                logger.warning("response cache: redis invalidation failed: %s", exc)
+
+
+response_cache = ResponseCache(redis=redis_client, route_ttls=cfg.cache.route_ttls, enabled=cfg.cache.enabled)
+
+
+class RouteCache:
+    """The response cache bound to one request: its route, path and query parameters and the calling user."""
+
+    def __init__(self, cache: ResponseCache, collection: str, request: Request, response: Response, user_id: int):
+        self.cache = cache
+        # headers other dependencies put on the injected response, FastAPI drops them for returned responses
+        self.headers = response.headers
+        self.collection = collection
+        self.route = request.scope["route"].name
+        self.ttl = cache.ttl(self.route)
+
+        params = sorted(request.query_params.multi_items())
+        digest = hashlib.sha256(f"{request.url.path}?{params}".encode()).hexdigest()
+        self.key = f"{self.route}:{user_id}:{digest}"
+
+    def vary(self, etag: str | None) -> None:
+        """Keys the cached body by the ETag sent with it, so a body read before a write is never served after it."""
+        if etag is not None:
+            self.key += ":" + etag.removeprefix("W/").strip('"')
+
+    async def get(self) -> Response | None:
+        if not self.ttl:
+            return None
+
+        body = await self.cache.get(self.key)
+        RESPONSE_CACHE_REQUESTS.labels(route=self.route, result="miss" if body is None else "hit").inc()
+        if body is None:
+            return None
+        return Response(content=body, media_type="application/json", headers={**self.headers, "X-Cache": "HIT"})
+
+    async def set(self, content: Any, owner_id: int | None) -> Response:
+        """Caches `content` read from the rows of `owner_id`, or of any user when it is None."""
+        # serialized like FastAPI's JSONResponse, so hits and misses return identical bodies
+        body = json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode()
+        if self.ttl:
+            await self.cache.set(scope(self.collection, owner_id), self.key, body, self.ttl)
+        return Response(content=body, media_type="application/json", headers={**self.headers, "X-Cache": "MISS"})
+
+
+def cached(collection: str) -> Callable:
+    # resolving the user first keeps authentication in front of every cache hit
+    async def dependency(
+        request: Request,
+        response: Response,
+        user: UserPrincipal = Depends(auth.get_current_user),
+    ) -> RouteCache:
+        return RouteCache(response_cache, collection, request, response, user.id)
+
+    return dependency
@@ -0,0 +1,64 @@
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import src.db as db
+import src.errors as errors
+from src.analytics import balance, spending
+from src.auth import auth
+from src.schemas.analytics import BalancePoint, Period, SpendingGroup, SpendingRow
+from src.schemas.categories import CategoryType
+from src.schemas.users import User, UserPrincipal
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["Analytics"],
+    responses=errors.error_responses(
+        errors.NotFoundException,
+        errors.ValidationException,
+        errors.AuthorizationException,
+    ),
+)
+
+
+@router.get(
+    "/spending",
+    summary="Sums, counts and averages of Transactions grouped by period, category and tag.",
+    response_model=list[SpendingRow],
+)
+async def get_spending(
+    user_id: int = Query(description="Owner of the Transactions"),
+    group_by: list[SpendingGroup] = Query([], description="Dimensions to group by, may be repeated"),
+    period: Period | None = Query(None, description="Bucket Transactions by day, week or month"),
+    date_from: datetime | None = Query(None, description="Include transactions from this date"),
+    date_to: datetime | None = Query(None, description="Include transactions up to this date"),
+    category_type: CategoryType | None = Query(None, description="Only income or only expense Transactions"),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
+):
+    user = await session.get(User, user_id)
+    if user is None:
+        raise errors.NotFoundException(entity_name="User", entity_id=user_id)
+
+    return await spending(session, user_id, group_by, period, date_from, date_to, category_type)
+
+
+@router.get(
+    "/balance",
+    summary="Income, expense and running balance per day, week or month.",
+    response_model=list[BalancePoint],
+)
+async def get_balance(
+    user_id: int = Query(description="Owner of the Transactions"),
+    date_from: date | None = Query(None, alias="from", description="First day of the chart"),
+    date_to: date | None = Query(None, alias="to", description="Last day of the chart"),
+    granularity: Period = Query(Period.day, description="Bucket size of the chart"),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
+):
+    user = await session.get(User, user_id)
+    if user is None:
+        raise errors.NotFoundException(entity_name="User", entity_id=user_id)
+
+    return await balance(session, user_id, granularity, date_from, date_to)
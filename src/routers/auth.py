@@ -1,12 +1,12 @@
 from datetime import datetime
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 import src.db as db
 import src.errors as errors
 from src.auth import auth
-from src.schemas.users import Token, User, UserDefault, UserLogin
+from src.schemas.users import Token, User, UserDefault, UserLogin, UserPrincipal
 
 router = APIRouter(
     prefix="/auth",
@@ -21,11 +21,11 @@ router = APIRouter(
 
 
 @router.post("/register", response_model=User, summary="Register a new user")
-def register(req: UserDefault, session: Session = Depends(db.get_session)):
+async def register(req: UserDefault, session: AsyncSession = Depends(db.get_session)):
 
     req.custom_validate(birth_date=req.birth_date)
 
-    existing_user = db.find_user(req.email)
+    existing_user = await db.find_user(session, req.email)
     if existing_user:
         raise errors.BadRequestException(detail="User with this email already exists")
 
@@ -37,16 +37,16 @@ def register(req: UserDefault, session: Session = Depends(db.get_session)):
     )
 
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
 
     return user
 
 
 @router.post("/login", response_model=Token, summary="Login user and return JWT token")
-def login(credentials: UserLogin, session: Session = Depends(db.get_session)):
+async def login(credentials: UserLogin, session: AsyncSession = Depends(db.get_session)):
 
-    user = session.query(User).filter(User.email == credentials.email).first()
+    user = await db.find_user(session, credentials.email)
     if not user or not auth.verify_password(credentials.password, user.password):
         raise errors.AuthorizationException(detail="Invalid email or password")
 
@@ -54,6 +54,6 @@ def login(credentials: UserLogin, session: Session = Depends(db.get_session)):
     return {"access_token": token, "token_type": "bearer"}
 
 
-@router.get("/me", response_model=User, summary="Get current user info")
-def get_me(current_user: User = Depends(auth.get_current_user)):
+@router.get("/me", response_model=UserPrincipal, summary="Get current user info")
+async def get_me(current_user: UserPrincipal = Depends(auth.get_current_user)):
     return current_user
@@ -1,16 +1,32 @@
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 from starlette import status
 
+import src.budget_usage as budget_usage
 import src.db as db
 import src.errors as errors
+import src.etag as etag
 from src.auth import auth
+from src.etag import CollectionETag
+from src.pagination import page_params, paginate
+from src.response_cache import RouteCache, cached, response_cache
 from src.schemas.base import DELETE_MODEL_RESPONSE
-from src.schemas.budgets import Budget, BudgetDefault, BudgetUpdate
+from src.schemas.budgets import (
+    Budget,
+    BudgetDefault,
+    BudgetStatus,
+    BudgetUpdate,
+    BudgetUsage,
+)
 from src.schemas.categories import Category
-from src.schemas.users import User
+from src.schemas.pagination import Page, PageParams
+from src.schemas.users import User, UserPrincipal
+
+PAGE_KEYS = (Budget.id,)
 
 router = APIRouter(
     prefix="/budgets",
@@ -19,79 +35,141 @@ router = APIRouter(
         errors.NotFoundException,
         errors.ValidationException,
         errors.AuthorizationException,
+        errors.BadRequestException,
     ),
 )
 
 
 @router.post("/", summary="Create a new Budget.", response_model=Budget)
-def create_budget(
+async def create_budget(
     request: BudgetDefault,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
     request.custom_validate(start_date=request.start_date, end_date=request.end_date)
 
-    user = session.get(User, request.user_id)
+    user = await session.get(User, request.user_id)
     if user is None:
         raise errors.NotFoundException(entity_name="User", entity_id=request.user_id)
 
-    category = session.get(Category, request.category_id)
+    category = await session.get(Category, request.category_id)
     if category is None:
         raise errors.NotFoundException(entity_name="Category", entity_id=request.category_id)
 
     budget = Budget(**request.dict(), created_at=datetime.utcnow())
 
     session.add(budget)
-    session.commit()
-    session.refresh(budget)
+    await session.flush()
+    await budget_usage.recompute(session, Budget.id == budget.id)
+    await etag.bump(session, "budgets", budget.user_id)
+    await session.commit()
+    await response_cache.invalidate("budgets", budget.user_id)
+    await session.refresh(budget)
 
     return budget
 
 
-@router.get("/", summary="Get a list of all budgets.", response_model=list[Budget])
+def budgets_query(user_id: int | None, category_id: int | None) -> SelectOfScalar:
+    query = select(Budget)
+
+    if user_id:
+        query = query.where(Budget.user_id == user_id)
+    if category_id:
+        query = query.where(Budget.category_id == category_id)
+
+    return query
+
+
+@router.get("/", summary="Get a list of all budgets.", response_model=Page[Budget])
 async def list_budgets(
     user_id: int | None = Query(None, description="Filter by User ID"),
     category_id: int | None = Query(None, description="Filter by Category ID"),
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    page: PageParams = Depends(page_params),
+    session: AsyncSession = Depends(db.get_session),
+    collection: CollectionETag = Depends(etag.collection_etag("budgets")),
+    cache: RouteCache = Depends(cached("budgets")),
 ):
-    query = session.query(Budget)
+    if collection.not_modified:
+        return collection.not_modified_response()
 
-    if user_id:
-        query = query.filter(Budget.user_id == user_id)
-    if category_id:
-        query = query.filter(Budget.category_id == category_id)
+    cache.vary(collection.etag)
+    cached_response = await cache.get()
+    if cached_response is not None:
+        return cached_response
 
-    budgets = query.all()
-    return budgets
+    query = budgets_query(user_id, category_id)
+    return await cache.set(await paginate(session, query, keys=PAGE_KEYS, page=page), owner_id=user_id)
 
 
 @router.get("/{budget_id}", summary="Get the Budget by id.", response_model=Budget)
 async def get_budget(
     budget_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    cache: RouteCache = Depends(cached("budgets")),
 ):
-    budget = session.query(Budget).filter(Budget.id == budget_id).first()
+    cached_response = await cache.get()
+    if cached_response is not None:
+        return cached_response
+
+    budget = await session.get(Budget, budget_id)
 
     if budget is None:
         raise errors.NotFoundException(entity_name="Budget", entity_id=budget_id)
 
-    return budget
+    return await cache.set(budget, owner_id=budget.user_id)
+
+
+@router.get(
+    "/{budget_id}/status", summary="Get spent and remaining amounts of the Budget.", response_model=BudgetStatus
+)
+async def get_budget_status(
+    budget_id: int,
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
+):
+    query = select(Budget, BudgetUsage).outerjoin(BudgetUsage).where(Budget.id == budget_id)
+    row = (await session.exec(query)).first()
+
+    if row is None:
+        raise errors.NotFoundException(entity_name="Budget", entity_id=budget_id)
+
+    budget, usage = row
+    if usage is None:
+        # budgets created before usage tracking existed get their counters on first read
+        await budget_usage.recompute(session, Budget.id == budget_id)
+        await session.commit()
+        usage = await session.get(BudgetUsage, budget_id)
+
+    return BudgetStatus(
+        budget_id=budget.id,
+        limit_amount=budget.limit_amount,
+        spent=usage.spent,
+        remaining=budget.limit_amount - usage.spent,
+        percent_used=float(usage.spent / budget.limit_amount * 100) if budget.limit_amount else 0.0,
+        transaction_count=usage.transaction_count,
+        updated_at=usage.updated_at,
+    )
 
 
 @router.put("/{budget_id}", summary="Update the Budget by id.", response_model=Budget)
-async def update_budget(budget_id: int, request: BudgetUpdate, session: Session = Depends(db.get_session)):
-    budget = session.query(Budget).filter(Budget.id == budget_id).first()
+async def update_budget(budget_id: int, request: BudgetUpdate, session: AsyncSession = Depends(db.get_session)):
+    budget = await session.get(Budget, budget_id)
 
     if budget is None:
         raise errors.NotFoundException(entity_name="Budget", entity_id=budget_id)
 
-    for key, value in request.dict(exclude_unset=True).items():
+    changes = request.dict(exclude_unset=True)
+    for key, value in changes.items():
         setattr(budget, key, value)
 
-    session.commit()
-    session.refresh(budget)
+    if changes.keys() & {"start_date", "end_date"}:
+        await session.flush()
+        await budget_usage.recompute(session, Budget.id == budget_id)
+
+    await etag.bump(session, "budgets", budget.user_id)
+    await session.commit()
+    await response_cache.invalidate("budgets", budget.user_id)
+    await session.refresh(budget)
 
     return budget
 
@@ -103,15 +181,17 @@ async def update_budget(budget_id: int, request: BudgetUpdate, session: Session
 )
 async def delete_budget(
     budget_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    budget = session.query(Budget).filter(Budget.id == budget_id).first()
+    budget = await session.get(Budget, budget_id)
 
     if budget is None:
         raise errors.NotFoundException(entity_name="Budget", entity_id=budget_id)
 
-    session.delete(budget)
-    session.commit()
+    await etag.bump(session, "budgets", budget.user_id)
+    await session.delete(budget)
+    await session.commit()
+    await response_cache.invalidate("budgets", budget.user_id)
 
     return {"detail": f"Budget with id {budget_id} has been deleted."}
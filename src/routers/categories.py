@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 from starlette import status
 
 import src.db as db
 import src.errors as errors
 from src.auth import auth
+from src.pagination import page_params, paginate
+from src.response_cache import RouteCache, cached, response_cache
 from src.schemas.base import DELETE_MODEL_RESPONSE
 from src.schemas.categories import (
     Category,
@@ -12,7 +16,10 @@ from src.schemas.categories import (
     CategoryType,
     CategoryUpdate,
 )
-from src.schemas.users import User
+from src.schemas.pagination import Page, PageParams
+from src.schemas.users import User, UserPrincipal
+
+PAGE_KEYS = (Category.id,)
 
 router = APIRouter(
     prefix="/categories",
@@ -21,6 +28,7 @@ router = APIRouter(
         errors.NotFoundException,
         errors.ValidationException,
         errors.AuthorizationException,
+        errors.BadRequestException,
     ),
 )
 
@@ -28,18 +36,19 @@ router = APIRouter(
 @router.post("/", summary="Create a new Category.", response_model=Category)
 async def create_category(
     request: CategoryDefault,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    user = session.get(User, request.user_id)
+    user = await session.get(User, request.user_id)
     if user is None:
         raise errors.NotFoundException(entity_name="User", entity_id=request.user_id)
 
     category = Category(**request.dict())
 
     session.add(category)
-    session.commit()
-    session.refresh(category)
+    await session.commit()
+    await response_cache.invalidate("categories", category.user_id)
+    await session.refresh(category)
 
     return category
 
@@ -47,54 +56,68 @@ async def create_category(
 @router.get("/{category_id}", summary="Get the Category by id.", response_model=Category)
 async def get_category(
     category_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    cache: RouteCache = Depends(cached("categories")),
 ):
-    category = session.query(Category).filter(Category.id == category_id).first()
+    cached_response = await cache.get()
+    if cached_response is not None:
+        return cached_response
+
+    category = await session.get(Category, category_id)
 
     if category is None:
         raise errors.NotFoundException(entity_name="Category", entity_id=category_id)
 
-    return category
+    return await cache.set(category, owner_id=category.user_id)
 
 
-@router.get("/", summary="List the Category.", response_model=list[Category])
-async def list_category(
-    user_id: str | None = Query(None, description="Filter by User ID"),
-    name: str | None = Query(None, description="Filter by Category Name"),
-    cat_type: CategoryType | None = Query(None, description="Filter by Category Type"),
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
-):
-    query = session.query(Category)
+def categories_query(user_id: int | None, name: str | None, cat_type: CategoryType | None) -> SelectOfScalar:
+    query = select(Category)
 
     if user_id:
-        query = query.filter(Category.user_id == user_id)
+        query = query.where(Category.user_id == user_id)
     if name:
-        query = query.filter(Category.name.ilike(f"%{name}%"))
+        query = query.where(Category.name.ilike(f"%{name}%"))
     if cat_type:
-        query = query.filter(Category.type == cat_type)
+        query = query.where(Category.type == cat_type)
+
+    return query
+
+
+@router.get("/", summary="List the Category.", response_model=Page[Category])
+async def list_category(
+    user_id: int | None = Query(None, description="Filter by User ID"),
+    name: str | None = Query(None, description="Filter by Category Name"),
+    cat_type: CategoryType | None = Query(None, description="Filter by Category Type"),
+    page: PageParams = Depends(page_params),
+    session: AsyncSession = Depends(db.get_session),
+    cache: RouteCache = Depends(cached("categories")),
+):
+    cached_response = await cache.get()
+    if cached_response is not None:
+        return cached_response
 
-    categories = query.all()
-    return categories
+    query = categories_query(user_id, name, cat_type)
+    return await cache.set(await paginate(session, query, keys=PAGE_KEYS, page=page), owner_id=user_id)
 
 
 @router.put("/{category_id}", summary="Update the Category by id.", response_model=Category)
 async def update_category(
     category_id: int,
     request: CategoryUpdate,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    category = session.query(Category).filter(Category.id == category_id).first()
+    category = await session.get(Category, category_id)
     if category is None:
         raise errors.NotFoundException(entity_name="Category", entity_id=category_id)
 
     for key, value in request.dict(exclude_unset=True).items():
         setattr(category, key, value)
 
-    session.commit()
-    session.refresh(category)
+    await session.commit()
+    await response_cache.invalidate("categories", category.user_id)
+    await session.refresh(category)
 
     return category
 
@@ -106,15 +129,16 @@ async def update_category(
 )
 async def delete_user(
     category_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    category = session.query(Category).filter(Category.id == category_id).first()
+    category = await session.get(Category, category_id)
 
     if category is None:
         raise errors.NotFoundException(entity_name="Category", entity_id=category_id)
 
-    session.delete(category)
-    session.commit()
+    await session.delete(category)
+    await session.commit()
+    await response_cache.invalidate("categories", category.user_id)
 
     return {"detail": f"Category with id {category_id} has been deleted."}
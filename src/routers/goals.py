@@ -1,15 +1,25 @@
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 from starlette import status
 
 import src.db as db
 import src.errors as errors
+import src.etag as etag
 from src.auth import auth
+from src.etag import CollectionETag
+from src.forecast import forecast_goals
+from src.pagination import page_params, paginate
+from src.response_cache import RouteCache, cached, response_cache
 from src.schemas.base import DELETE_MODEL_RESPONSE
-from src.schemas.goals import Goal, GoalDefault, GoalUpdate
-from src.schemas.users import User
+from src.schemas.goals import Goal, GoalDefault, GoalForecast, GoalUpdate
+from src.schemas.pagination import Page, PageParams
+from src.schemas.users import User, UserPrincipal
+
+PAGE_KEYS = (Goal.id,)
 
 router = APIRouter(
     prefix="/goals",
@@ -18,6 +28,7 @@ router = APIRouter(
         errors.NotFoundException,
         errors.ValidationException,
         errors.AuthorizationException,
+        errors.BadRequestException,
     ),
 )
 
@@ -25,72 +36,120 @@ router = APIRouter(
 @router.post("/", summary="Create a new Goal.", response_model=Goal)
 async def create_goal(
     request: GoalDefault,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
     request.custom_validate(deadline=request.deadline)
 
-    user = session.get(User, request.user_id)
+    user = await session.get(User, request.user_id)
     if user is None:
         raise errors.NotFoundException(entity_name="User", entity_id=request.user_id)
 
     goal = Goal(**request.dict(), created_at=datetime.utcnow())
 
     session.add(goal)
-    session.commit()
-    session.refresh(goal)
+    await etag.bump(session, "goals", goal.user_id)
+    await session.commit()
+    await response_cache.invalidate("goals", goal.user_id)
+    await session.refresh(goal)
 
     return goal
 
 
+@router.get("/forecast", summary="Forecast completion of all Goals of a User.", response_model=list[GoalForecast])
+async def forecast_user_goals(
+    user_id: int = Query(description="Owner of the Goals"),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
+):
+    user = await session.get(User, user_id)
+    if user is None:
+        raise errors.NotFoundException(entity_name="User", entity_id=user_id)
+
+    return await forecast_goals(session, Goal.user_id == user_id)
+
+
 @router.get("/{goal_id}", summary="Get the Goal by id.", response_model=Goal)
 async def get_goal(
     goal_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    cache: RouteCache = Depends(cached("goals")),
 ):
-    goal = session.query(Goal).filter(Goal.id == goal_id).first()
+    cached_response = await cache.get()
+    if cached_response is not None:
+        return cached_response
+
+    goal = await session.get(Goal, goal_id)
 
     if goal is None:
         raise errors.NotFoundException(entity_name="Goal", entity_id=goal_id)
 
-    return goal
+    return await cache.set(goal, owner_id=goal.user_id)
+
+
+def goals_query(user_id: int | None, name: str | None) -> SelectOfScalar:
+    query = select(Goal)
+
+    if user_id:
+        query = query.where(Goal.user_id == user_id)
+    if name:
+        query = query.where(Goal.name.ilike(f"%{name}%"))
+
+    return query
 
 
-@router.get("/", summary="List all Goals.", response_model=list[Goal])
+@router.get("/", summary="List all Goals.", response_model=Page[Goal])
 async def list_goals(
     user_id: int | None = Query(None, description="Filter by User ID"),
     name: str | None = Query(None, description="Filter by Goal Name"),
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    page: PageParams = Depends(page_params),
+    session: AsyncSession = Depends(db.get_session),
+    collection: CollectionETag = Depends(etag.collection_etag("goals")),
+    cache: RouteCache = Depends(cached("goals")),
 ):
-    query = session.query(Goal)
+    if collection.not_modified:
+        return collection.not_modified_response()
 
-    if user_id:
-        query = query.filter(Goal.user_id == user_id)
-    if name:
-        query = query.filter(Goal.name.ilike(f"%{name}%"))
+    cache.vary(collection.etag)
+    cached_response = await cache.get()
+    if cached_response is not None:
+        return cached_response
+
+    query = goals_query(user_id, name)
+    return await cache.set(await paginate(session, query, keys=PAGE_KEYS, page=page), owner_id=user_id)
+
+
+@router.get("/{goal_id}/forecast", summary="Forecast completion of the Goal.", response_model=GoalForecast)
+async def forecast_goal(
+    goal_id: int,
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
+):
+    forecasts = await forecast_goals(session, Goal.id == goal_id)
+    if not forecasts:
+        raise errors.NotFoundException(entity_name="Goal", entity_id=goal_id)
 
-    goals = query.all()
-    return goals
+    return forecasts[0]
 
 
 @router.put("/{goal_id}", summary="Update the Goal by id.", response_model=Goal)
 async def update_goal(
     goal_id: int,
     request: GoalUpdate,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    goal = session.query(Goal).filter(Goal.id == goal_id).first()
+    goal = await session.get(Goal, goal_id)
     if goal is None:
         raise errors.NotFoundException(entity_name="Goal", entity_id=goal_id)
 
     for key, value in request.dict(exclude_unset=True).items():
         setattr(goal, key, value)
 
-    session.commit()
-    session.refresh(goal)
+    await etag.bump(session, "goals", goal.user_id)
+    await session.commit()
+    await response_cache.invalidate("goals", goal.user_id)
+    await session.refresh(goal)
 
     return goal
 
@@ -102,15 +161,17 @@ async def update_goal(
 )
 async def delete_goal(
     goal_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    goal = session.query(Goal).filter(Goal.id == goal_id).first()
+    goal = await session.get(Goal, goal_id)
 
     if goal is None:
         raise errors.NotFoundException(entity_name="Goal", entity_id=goal_id)
 
-    session.delete(goal)
-    session.commit()
+    await etag.bump(session, "goals", goal.user_id)
+    await session.delete(goal)
+    await session.commit()
+    await response_cache.invalidate("goals", goal.user_id)
 
     return {"detail": f"Goal with id {goal_id} has been deleted."}
@@ -1,38 +1,129 @@
+import time
+from contextlib import asynccontextmanager
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import AsyncIterator
+
 import httpx
-from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from src.config import cfg
+from src.metrics import GRAPHQL_UPSTREAM_ERRORS, GRAPHQL_UPSTREAM_LATENCY
+
+GRAPHQL_SERVICE_BASE = cfg.graphql.url
+GRAPHQL_ENDPOINT = f"{GRAPHQL_SERVICE_BASE}/graphql"
+
+# headers about one connection only (RFC 9110, 7.6.1), never forwarded by a proxy
+HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "proxy-connection",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[dict[str, httpx.AsyncClient]]:
+    # one client for the app's lifetime, so proxied requests reuse kept-alive connections;
+    # it is shared by all users, so it must not keep cookies or ask for encodings the caller did not
+    client = httpx.AsyncClient(
+        cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        headers={"accept-encoding": "identity"},
+        limits=httpx.Limits(
+            max_connections=cfg.graphql.max_connections,
+            max_keepalive_connections=cfg.graphql.max_keepalive_connections,
+            keepalive_expiry=cfg.graphql.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            connect=cfg.graphql.connect_timeout,
+            read=cfg.graphql.read_timeout,
+            write=cfg.graphql.write_timeout,
+            pool=cfg.graphql.pool_timeout,
+        ),
+    )
+    try:
+        yield {"graphql_client": client}
+    finally:
+        await client.aclose()
+
 
 router = APIRouter(
     prefix="",
     tags=["GraphQL"],
+    lifespan=lifespan,
 )
 
-GRAPHQL_SERVICE_BASE = cfg.graphql.url
-GRAPHQL_ENDPOINT = f"{GRAPHQL_SERVICE_BASE}/graphql"
+
+def forwarded_headers(headers: list[tuple[str, str]], *drop: str) -> list[tuple[str, str]]:
+    # pairs rather than a dict, so that repeated headers such as `Set-Cookie` are all kept;
+    # `Connection` may name further headers that are specific to the connection
+    connection = {
+        option.strip().lower() for name, value in headers if name.lower() == "connection" for option in value.split(",")
+    }
+    skip = HOP_BY_HOP_HEADERS | connection | set(drop)
+    return [(name, value) for name, value in headers if name.lower() not in skip]
+
+
+def upstream_error(exc: httpx.RequestError) -> tuple[str, HTTPException]:
+    if isinstance(exc, httpx.PoolTimeout):
+        return "pool", HTTPException(status_code=503, detail="No free connection to the GraphQL service")
+    if isinstance(exc, httpx.TimeoutException):
+        return "timeout", HTTPException(status_code=504, detail="GraphQL service timed out")
+    if isinstance(exc, httpx.ConnectError):
+        return "connect", HTTPException(status_code=502, detail=f"Error connecting to GraphQL service: {exc}")
+    return "other", HTTPException(status_code=502, detail=f"Error requesting GraphQL service: {exc}")
+
+
+async def relay(response: httpx.Response) -> AsyncIterator[bytes]:
+    try:
+        # raw bytes: the body is passed on still encoded, as `Content-Encoding` says
+        async for chunk in response.aiter_raw():
+            yield chunk
+    except httpx.RequestError:
+        # the status is already sent, the client only sees a truncated body
+        GRAPHQL_UPSTREAM_ERRORS.labels(reason="stream").inc()
+        raise
 
 
 @router.api_route("/graphql", methods=["GET", "POST"])
 async def graphql_proxy(request: Request):
-    body = await request.body()
-    params = dict(request.query_params)
-
-    async with httpx.AsyncClient() as client:
-        try:
-            proxied = await client.request(
-                method=request.method,
-                url=GRAPHQL_ENDPOINT,
-                headers={k: v for k, v in request.headers.items() if k.lower() != "host"},
-                content=body,
-                params=params,
-                timeout=30.0,
-            )
-        except httpx.RequestError as exc:
-            raise HTTPException(status_code=502, detail=f"Error connecting to GraphQL service: {exc}")
-
-    return Response(
-        content=proxied.content,
-        status_code=proxied.status_code,
-        headers=dict(proxied.headers),
-        media_type=proxied.headers.get("content-type"),
+    client: httpx.AsyncClient = request.state.graphql_client
+    upstream_request = client.build_request(
+        method=request.method,
+        url=GRAPHQL_ENDPOINT,
+        headers=forwarded_headers(request.headers.items(), "host"),
+        content=request.stream() if request.method == "POST" else None,
+        params=request.query_params.multi_items(),
+    )
+
+    start = time.perf_counter()
+    try:
+        upstream = await client.send(upstream_request, stream=True)
+    except httpx.RequestError as exc:
+        reason, error = upstream_error(exc)
+        GRAPHQL_UPSTREAM_ERRORS.labels(reason=reason).inc()
+        raise error
+    GRAPHQL_UPSTREAM_LATENCY.labels(method=request.method).observe(time.perf_counter() - start)
+
+    if upstream.status_code >= 500:
+        GRAPHQL_UPSTREAM_ERRORS.labels(reason="status").inc()
+
+    response = StreamingResponse(
+        relay(upstream),
+        status_code=upstream.status_code,
+        background=BackgroundTask(upstream.aclose),
     )
+    response.raw_headers = [
+        (name.encode("latin-1"), value.encode("latin-1"))
+        # `date` and `server` are set by this server again
+        for name, value in forwarded_headers(upstream.headers.multi_items(), "date", "server")
+    ]
+    return response
@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import src.db as db
+import src.errors as errors
+from src.auth import auth
+from src.config import cfg
+from src.schemas.categories import Category
+from src.schemas.goals import Goal
+from src.schemas.search import SearchHit
+from src.schemas.tags import Tag
+from src.schemas.transactions import Transaction
+from src.schemas.users import UserPrincipal
+from src.search import search_names, search_transactions
+
+router = APIRouter(
+    prefix="/search",
+    tags=["Search"],
+    responses=errors.error_responses(
+        errors.ValidationException,
+        errors.AuthorizationException,
+    ),
+)
+
+QUERY = Query(min_length=1, description="Search terms, each one is matched as a word prefix")
+USER_ID = Query(None, description="Filter by User ID")
+LIMIT = Query(cfg.pagination.default_size, ge=1, le=cfg.pagination.max_size, description="Maximum number of hits")
+
+
+@router.get(
+    "/transactions",
+    summary="Full-text search over Transaction descriptions.",
+    response_model=list[SearchHit[Transaction]],
+)
+async def search_transactions_by_description(
+    q: str = QUERY,
+    user_id: int | None = USER_ID,
+    limit: int = LIMIT,
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
+):
+    return await search_transactions(session, q, user_id, limit)
+
+
+@router.get("/categories", summary="Fuzzy search over Category names.", response_model=list[SearchHit[Category]])
+async def search_categories(
+    q: str = QUERY,
+    user_id: int | None = USER_ID,
+    limit: int = LIMIT,
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
+):
+    return await search_names(session, Category, q, user_id, limit)
+
+
+@router.get("/tags", summary="Fuzzy search over Tag names.", response_model=list[SearchHit[Tag]])
+async def search_tags(
+    q: str = QUERY,
+    user_id: int | None = USER_ID,
+    limit: int = LIMIT,
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
+):
+    return await search_names(session, Tag, q, user_id, limit)
+
+
+@router.get("/goals", summary="Fuzzy search over Goal names.", response_model=list[SearchHit[Goal]])
+async def search_goals(
+    q: str = QUERY,
+    user_id: int | None = USER_ID,
+    limit: int = LIMIT,
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
+):
+    return await search_names(session, Goal, q, user_id, limit)
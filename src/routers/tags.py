@@ -1,13 +1,20 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
 from starlette import status
 
 import src.db as db
 import src.errors as errors
 from src.auth import auth
+from src.pagination import page_params, paginate
+from src.response_cache import RouteCache, cached, response_cache
 from src.schemas.base import DELETE_MODEL_RESPONSE
+from src.schemas.pagination import Page, PageParams
 from src.schemas.tags import Tag, TagDefault, TagUpdate
-from src.schemas.users import User
+from src.schemas.users import User, UserPrincipal
+
+PAGE_KEYS = (Tag.id,)
 
 router = APIRouter(
     prefix="/tags",
@@ -16,6 +23,7 @@ router = APIRouter(
         errors.NotFoundException,
         errors.ValidationException,
         errors.AuthorizationException,
+        errors.BadRequestException,
     ),
 )
 
@@ -23,17 +31,18 @@ router = APIRouter(
 @router.post("/", summary="Create a new Tag.", response_model=Tag)
 async def create_tag(
     request: TagDefault,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    user = session.get(User, request.user_id)
+    user = await session.get(User, request.user_id)
     if user is None:
         raise errors.NotFoundException(entity_name="User", entity_id=request.user_id)
 
     tag = Tag(**request.dict())
     session.add(tag)
-    session.commit()
-    session.refresh(tag)
+    await session.commit()
+    await response_cache.invalidate("tags", tag.user_id)
+    await session.refresh(tag)
 
     return tag
 
@@ -41,62 +50,78 @@ async def create_tag(
 @router.get("/{tag_id}", summary="Get the Tag by id.", response_model=Tag)
 async def get_tag(
     tag_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    cache: RouteCache = Depends(cached("tags")),
 ):
-    tag = session.query(Tag).filter(Tag.id == tag_id).first()
+    cached_response = await cache.get()
+    if cached_response is not None:
+        return cached_response
+
+    tag = await session.get(Tag, tag_id)
     if tag is None:
         raise errors.NotFoundException(entity_name="Tag", entity_id=tag_id)
-    return tag
+    return await cache.set(tag, owner_id=tag.user_id)
+
+
+def tags_query(user_id: int | None, name: str | None) -> SelectOfScalar:
+    query = select(Tag)
+
+    if user_id is not None:
+        query = query.where(Tag.user_id == user_id)
+    if name:
+        query = query.where(Tag.name.ilike(f"%{name}%"))
+
+    return query
 
 
-@router.get("/", summary="List Tags.", response_model=list[Tag])
+@router.get("/", summary="List Tags.", response_model=Page[Tag])
 async def list_tags(
     user_id: int | None = Query(None, description="Filter by User ID"),
     name: str | None = Query(None, description="Filter by Tag Name"),
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    page: PageParams = Depends(page_params),
+    session: AsyncSession = Depends(db.get_session),
+    cache: RouteCache = Depends(cached("tags")),
 ):
-    query = session.query(Tag)
-
-    if user_id is not None:
-        query = query.filter(Tag.user_id == user_id)
-    if name:
-        query = query.filter(Tag.name.ilike(f"%{name}%"))
+    cached_response = await cache.get()
+    if cached_response is not None:
+        return cached_response
 
-    return query.all()
+    query = tags_query(user_id, name)
+    return await cache.set(await paginate(session, query, keys=PAGE_KEYS, page=page), owner_id=user_id)
 
 
 @router.put("/{tag_id}", summary="Update the Tag by id.", response_model=Tag)
 async def update_tag(
     tag_id: int,
     request: TagUpdate,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    tag = session.query(Tag).filter(Tag.id == tag_id).first()
+    tag = await session.get(Tag, tag_id)
     if tag is None:
         raise errors.NotFoundException(entity_name="Tag", entity_id=tag_id)
 
     for key, value in request.dict(exclude_unset=True).items():
         setattr(tag, key, value)
 
-    session.commit()
-    session.refresh(tag)
+    await session.commit()
+    await response_cache.invalidate("tags", tag.user_id)
+    await session.refresh(tag)
     return tag
 
 
 @router.delete("/{tag_id}", summary="Delete the Tag by id.", responses={status.HTTP_200_OK: DELETE_MODEL_RESPONSE})
 async def delete_tag(
     tag_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    tag = session.query(Tag).filter(Tag.id == tag_id).first()
+    tag = await session.get(Tag, tag_id)
     if tag is None:
         raise errors.NotFoundException(entity_name="Tag", entity_id=tag_id)
 
-    session.delete(tag)
-    session.commit()
+    await session.delete(tag)
+    await session.commit()
+    await response_cache.invalidate("tags", tag.user_id)
 
     return {"detail": f"Tag with id {tag_id} has been deleted."}
@@ -1,15 +1,41 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, insert
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette import status
 
+import src.budget_usage as budget_usage
+import src.daily_balance as daily_balance
 import src.db as db
 import src.errors as errors
+import src.etag as etag
 from src.auth import auth
+from src.bulk_import import import_transactions
+from src.etag import CollectionETag
+from src.export import EXPORT_COLUMNS, MEDIA_TYPES, export_stream
+from src.pagination import page_params, paginate_rows
 from src.schemas.base import DELETE_MODEL_RESPONSE
 from src.schemas.categories import Category, TransactionWithCategory
-from src.schemas.tags import Tag, TransactionTagLink, TransactionWithTags
-from src.schemas.transactions import Transaction, TransactionCreate, TransactionUpdate
-from src.schemas.users import User
+from src.schemas.pagination import Page, PageParams
+from src.schemas.tags import TransactionTagLink, TransactionWithTags
+from src.schemas.transactions import (
+    FileFormat,
+    ImportResult,
+    Transaction,
+    TransactionCreate,
+    TransactionDefault,
+    TransactionUpdate,
+)
+from src.schemas.users import User, UserPrincipal
+from src.serialization import FastJSONResponse, model_columns
+
+TRANSACTION_COLUMNS = model_columns(Transaction)
+# newest first, see `list_transactions`
+PAGE_KEYS = (Transaction.date, Transaction.id)
 
 router = APIRouter(
     prefix="/transactions",
@@ -18,6 +44,7 @@ router = APIRouter(
         errors.NotFoundException,
         errors.ValidationException,
         errors.AuthorizationException,
+        errors.BadRequestException,
     ),
 )
 
@@ -25,37 +52,35 @@ router = APIRouter(
 @router.post("/", summary="Create a new Transaction.", response_model=TransactionWithTags)
 async def create_transaction(
     request: TransactionCreate,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    user = session.get(User, request.user_id)
+    user = await session.get(User, request.user_id)
     if not user:
         raise errors.NotFoundException(entity_name="User", entity_id=request.user_id)
 
-    category = session.get(Category, request.category_id)
+    category = await session.get(Category, request.category_id)
     if not category:
         raise errors.NotFoundException(entity_name="Category", entity_id=request.category_id)
 
-    transaction = Transaction(
-        user_id=request.user_id,
-        category_id=request.category_id,
-        amount=request.amount,
-        date=request.date,
-        description=request.description,
-    )
-
-    session.add(transaction)
-    session.commit()
-    session.refresh(transaction)
-
-    if request.tag_ids:
-        for tag_id in request.tag_ids:
-            tag = session.query(Tag).filter(Tag.id == tag_id).first()
-            if tag:
-                transaction_tag_link = TransactionTagLink(transaction_id=transaction.id, tag_id=tag.id)
-                session.add(transaction_tag_link)
-
-        session.commit()
+    # everything below runs in a single database transaction committed once
+    transaction = (
+        await session.execute(
+            insert(Transaction).values(**request.model_dump(exclude={"tag_ids"})).returning(Transaction)
+        )
+    ).scalar_one()
+    await budget_usage.track(session, transaction)
+    await daily_balance.track(session, transaction)
+
+    tags = await db.find_tags(session, request.tag_ids)
+    if tags:
+        await session.execute(
+            insert(TransactionTagLink),
+            [{"transaction_id": transaction.id, "tag_id": tag.id} for tag in tags],
+        )
+
+    await etag.bump(session, "transactions", transaction.user_id)
+    await session.commit()
 
     return TransactionWithTags(
         id=transaction.id,
@@ -64,37 +89,102 @@ async def create_transaction(
         amount=transaction.amount,
         date=transaction.date,
         description=transaction.description,
-        tags=transaction.tags,
+        tags=tags,
     )
 
 
-@router.get("/", summary="List Transactions.", response_model=list[Transaction])
+def transactions_query(user_id: int | None, category_id: int | None, description: str | None) -> Select:
+    # plain column tuples rendered by orjson: large pages skip ORM loading and response model validation
+    query = select(*TRANSACTION_COLUMNS)
+
+    if user_id is not None:
+        query = query.where(Transaction.user_id == user_id)
+    if category_id is not None:
+        query = query.where(Transaction.category_id == category_id)
+    if description:
+        query = query.where(Transaction.description.ilike(f"%{description}%"))
+
+    return query
+
+
+@router.get("/", summary="List Transactions.", response_model=Page[Transaction])
 async def list_transactions(
+    response: Response,
     user_id: int | None = Query(None),
     category_id: int | None = Query(None),
     description: str | None = Query(None),
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    page: PageParams = Depends(page_params),
+    session: AsyncSession = Depends(db.get_session),
+    collection: CollectionETag = Depends(etag.collection_etag("transactions")),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    query = session.query(Transaction)
+    if collection.not_modified:
+        return collection.not_modified_response()
+
+    query = transactions_query(user_id, category_id, description)
+    content = await paginate_rows(session, query, keys=PAGE_KEYS, page=page, descending=True)
+    return FastJSONResponse(content, headers=response.headers)
+
+
+@router.post("/import", summary="Bulk import Transactions from CSV or NDJSON.", response_model=ImportResult)
+async def import_transactions_file(
+    file: UploadFile,
+    user_id: int = Query(description="Owner of the imported Transactions"),
+    fmt: FileFormat = Query(FileFormat.csv, alias="format", description="Input format"),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
+):
+    user = await session.get(User, user_id)
+    if user is None:
+        raise errors.NotFoundException(entity_name="User", entity_id=user_id)
+
+    return await import_transactions(session, user_id, file, fmt)
+
+
+@router.get(
+    "/export",
+    summary="Stream Transactions as CSV or NDJSON.",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}},
+    },
+)
+async def export_transactions(
+    user_id: int | None = Query(None, description="Filter by User ID"),
+    category_id: int | None = Query(None, description="Filter by Category ID"),
+    date_from: datetime | None = Query(None, description="Include transactions from this date"),
+    date_to: datetime | None = Query(None, description="Include transactions up to this date"),
+    fmt: FileFormat = Query(FileFormat.csv, alias="format", description="Output format"),
+    compress: bool = Query(False, alias="gzip", description="Gzip the response body"),
+    _: UserPrincipal = Depends(auth.get_current_user),
+):
+    query = select(*EXPORT_COLUMNS)
 
     if user_id is not None:
-        query = query.filter(Transaction.user_id == user_id)
+        query = query.where(Transaction.user_id == user_id)
     if category_id is not None:
-        query = query.filter(Transaction.category_id == category_id)
-    if description:
-        query = query.filter(Transaction.description.ilike(f"%{description}%"))
+        query = query.where(Transaction.category_id == category_id)
+    if date_from is not None:
+        query = query.where(Transaction.date >= date_from)
+    if date_to is not None:
+        query = query.where(Transaction.date <= date_to)
+
+    query = query.order_by(Transaction.date, Transaction.id)
 
-    return query.all()
+    headers = {"Content-Disposition": f'attachment; filename="transactions.{fmt.value}"'}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(export_stream(query, fmt, compress), media_type=MEDIA_TYPES[fmt], headers=headers)
 
 
 @router.get("/{transaction_id}", summary="Get Transaction by ID", response_model=Transaction)
 async def get_transaction(
     transaction_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    transaction = session.get(Transaction, transaction_id)
+    transaction = await session.get(Transaction, transaction_id)
     if not transaction:
         raise errors.NotFoundException(entity_name="Transaction", entity_id=transaction_id)
 
@@ -105,18 +195,28 @@ async def get_transaction(
 async def update_transaction(
     transaction_id: int,
     request: TransactionUpdate,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    transaction = session.get(Transaction, transaction_id)
+    transaction = await session.get(Transaction, transaction_id)
     if not transaction:
         raise errors.NotFoundException(entity_name="Transaction", entity_id=transaction_id)
 
-    for key, value in request.model_dump(exclude_unset=True).items():
+    previous = TransactionDefault.model_validate(transaction)
+    for key, value in request.model_dump(exclude_unset=True, exclude={"tag_ids"}).items():
         setattr(transaction, key, value)
 
-    session.commit()
-    session.refresh(transaction)
+    if (previous.amount, previous.date) != (transaction.amount, transaction.date):
+        for tracker in (budget_usage, daily_balance):
+            await tracker.track(session, previous, sign=-1)
+            await tracker.track(session, transaction)
+
+    if request.tag_ids is not None:
+        await db.replace_transaction_tags(session, transaction_id, await db.find_tags(session, request.tag_ids))
+
+    await etag.bump(session, "transactions", transaction.user_id)
+    await session.commit()
+    await session.refresh(transaction)
     return transaction
 
 
@@ -127,15 +227,18 @@ async def update_transaction(
 )
 async def delete_transaction(
     transaction_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    transaction = session.get(Transaction, transaction_id)
+    transaction = await session.get(Transaction, transaction_id)
     if not transaction:
         raise errors.NotFoundException(entity_name="Transaction", entity_id=transaction_id)
 
-    session.delete(transaction)
-    session.commit()
+    await budget_usage.track(session, transaction, sign=-1)
+    await daily_balance.track(session, transaction, sign=-1)
+    await etag.bump(session, "transactions", transaction.user_id)
+    await session.delete(transaction)
+    await session.commit()
 
     return {"detail": f"Transaction with id {transaction_id} has been deleted."}
 
@@ -147,10 +250,10 @@ async def delete_transaction(
 )
 async def get_transaction_with_category(
     transaction_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    transaction = session.query(Transaction).filter(Transaction.id == transaction_id).first()
+    transaction = await session.get(Transaction, transaction_id, options=[selectinload(Transaction.category)])
 
     if not transaction:
         raise errors.NotFoundException(entity_name="Transaction", entity_id=transaction_id)
@@ -173,10 +276,10 @@ async def get_transaction_with_category(
 )
 async def get_transaction_with_tags(
     transaction_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    transaction = session.query(Transaction).filter(Transaction.id == transaction_id).first()
+    transaction = await session.get(Transaction, transaction_id, options=[selectinload(Transaction.tags)])
 
     if not transaction:
         raise errors.NotFoundException(entity_name="Transaction", entity_id=transaction_id)
@@ -1,12 +1,16 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette import status
 
 import src.db as db
 import src.errors as errors
 from src.auth import auth
+from src.cache import principal_cache
+from src.pagination import page_params, paginate
 from src.schemas.base import DELETE_MODEL_RESPONSE
-from src.schemas.users import User, UserUpdate
+from src.schemas.pagination import Page, PageParams
+from src.schemas.users import User, UserPrincipal, UserUpdate
 
 router = APIRouter(
     prefix="/users",
@@ -15,28 +19,27 @@ router = APIRouter(
         errors.NotFoundException,
         errors.ValidationException,
         errors.AuthorizationException,
+        errors.BadRequestException,
     ),
 )
 
 
-@router.get("/", summary="Get a list of all users.", response_model=list[User])
+@router.get("/", summary="Get a list of all users.", response_model=Page[User])
 async def get_users(
-    skip: int = 0,
-    limit: int = 10,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    page: PageParams = Depends(page_params),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    users = session.query(User).offset(skip).limit(limit).all()
-    return users
+    return await paginate(session, select(User), keys=(User.id,), page=page)
 
 
 @router.get("/{user_id}", summary="Get the User by id.", response_model=User)
 async def get_user(
     user_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    user = session.query(User).filter(User.id == user_id).first()
+    user = await session.get(User, user_id)
 
     if user is None:
         raise errors.NotFoundException(entity_name="User", entity_id=user_id)
@@ -48,20 +51,21 @@ async def get_user(
 async def update_user(
     user_id: int,
     request: UserUpdate,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
     request.custom_validate(birth_date=request.birth_date)
 
-    user = session.query(User).filter(User.id == user_id).first()
+    user = await session.get(User, user_id)
     if user is None:
         raise errors.NotFoundException(entity_name="User", entity_id=user_id)
 
     for key, value in request.dict(exclude_unset=True).items():
         setattr(user, key, value)
 
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
+    await principal_cache.invalidate(user.email)
 
     return user
 
@@ -73,15 +77,16 @@ async def update_user(
 )
 async def delete_user(
     user_id: int,
-    session: Session = Depends(db.get_session),
-    _: User = Depends(auth.get_current_user),
+    session: AsyncSession = Depends(db.get_session),
+    _: UserPrincipal = Depends(auth.get_current_user),
 ):
-    user = session.query(User).filter(User.id == user_id).first()
+    user = await session.get(User, user_id)
 
     if user is None:
         raise errors.NotFoundException(entity_name="User", entity_id=user_id)
 
-    session.delete(user)
-    session.commit()
+    await session.delete(user)
+    await session.commit()
+    await principal_cache.invalidate(user.email)
 
     return {"detail": f"User with id {user_id} has been deleted."}
@@ -0,0 +1,50 @@
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+
+from pydantic import BaseModel
+from sqlmodel import Field, SQLModel
+
+from src.schemas.categories import CategoryType
+
+
+class Period(Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class SpendingGroup(Enum):
+    category = "category"
+    category_type = "category_type"
+    tag = "tag"
+
+
+class SpendingRow(BaseModel):
+    bucket: datetime | None = None
+    category_id: int | None = None
+    category_type: CategoryType | None = None
+    tag_id: int | None = None
+    total: Decimal
+    count: int
+    average: Decimal
+
+
+class DailyBalance(SQLModel, table=True):
+    """Per user, day and category sums of Transactions, maintained by `src.daily_balance`."""
+
+    __tablename__ = "daily_balance"
+
+    user_id: int = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    day: date = Field(primary_key=True)
+    category_id: int = Field(foreign_key="category.id", primary_key=True, ondelete="CASCADE")
+    amount: Decimal = Field(default=0, decimal_places=2, max_digits=14)
+    transaction_count: int = Field(default=0)
+
+
+class BalancePoint(BaseModel):
+    bucket: datetime
+    income: Decimal
+    expense: Decimal
+    net: Decimal
+    balance: Decimal
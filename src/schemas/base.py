@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from sqlalchemy import DDL, Index, event
 from sqlmodel import SQLModel
 
 from src import errors
@@ -9,6 +10,19 @@ DELETE_MODEL_RESPONSE = {
     "content": {"application/json": {"example": {"message": "string"}}},
 }
 
+# trigram indexes back substring search on text columns, see `src.search`
+event.listen(
+    SQLModel.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+def trigram_index(name: str, column: str) -> Index:
+    return Index(name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}).ddl_if(
+        dialect="postgresql"
+    )
+
 
 class BaseSQLModel(SQLModel):
 
@@ -1,7 +1,8 @@
 from datetime import datetime
 from decimal import Decimal
 
-from sqlmodel import Field, Relationship
+from sqlalchemy import Index
+from sqlmodel import Field, Relationship, SQLModel
 
 from src.schemas.base import BaseSQLModel
 
@@ -21,6 +22,11 @@ class BudgetDefault(BaseSQLModel):
 
 
 class Budget(BudgetDefault, table=True):
+    __table_args__ = (
+        Index("ix_budget_user_id", "user_id"),
+        Index("ix_budget_category_id", "category_id"),
+    )
+
     id: int = Field(default=None, primary_key=True, sa_column_kwargs={"autoincrement": True})
     created_at: datetime
 
@@ -28,6 +34,27 @@ class Budget(BudgetDefault, table=True):
     category: "Category" = Relationship(back_populates="budgets")  # noqa: F821
 
 
+class BudgetUsage(SQLModel, table=True):
+    """Running totals of the Transactions a Budget covers, maintained by `src.budget_usage`."""
+
+    __tablename__ = "budget_usage"
+
+    budget_id: int = Field(foreign_key="budget.id", primary_key=True, ondelete="CASCADE")
+    spent: Decimal = Field(default=0, decimal_places=2, max_digits=12)
+    transaction_count: int = Field(default=0)
+    updated_at: datetime
+
+
+class BudgetStatus(BaseSQLModel):
+    budget_id: int
+    limit_amount: Decimal
+    spent: Decimal
+    remaining: Decimal
+    percent_used: float
+    transaction_count: int
+    updated_at: datetime
+
+
 class BudgetUpdate(BaseSQLModel):
     limit_amount: Decimal | None = None
     start_date: datetime | None = None
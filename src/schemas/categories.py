@@ -2,9 +2,10 @@ from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
-from src.schemas.base import BaseSQLModel
+from src.schemas.base import BaseSQLModel, trigram_index
 
 
 class CategoryType(Enum):
@@ -19,6 +20,11 @@ class CategoryDefault(BaseSQLModel):
 
 
 class Category(CategoryDefault, table=True):
+    __table_args__ = (
+        Index("ix_category_user_id", "user_id"),
+        trigram_index("ix_category_name_trgm", "name"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     user: "User" = Relationship(back_populates="categories")  # noqa: F821
     transactions: list["Transaction"] = Relationship(back_populates="category")  # noqa: F821
@@ -1,9 +1,10 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
-from src.schemas.base import BaseSQLModel
+from src.schemas.base import BaseSQLModel, trigram_index
 
 
 class GoalDefault(BaseSQLModel):
@@ -19,6 +20,11 @@ class GoalDefault(BaseSQLModel):
 
 
 class Goal(GoalDefault, table=True):
+    __table_args__ = (
+        Index("ix_goal_user_id", "user_id"),
+        trigram_index("ix_goal_name_trgm", "name"),
+    )
+
     id: int = Field(default=None, primary_key=True, sa_column_kwargs={"autoincrement": True})
     created_at: datetime
 
@@ -34,3 +40,13 @@ class GoalUpdate(BaseSQLModel):
     @classmethod
     def custom_validate(cls, deadline: datetime) -> None:
         cls.validate_future_date(date=deadline, field_name="deadline")
+
+
+class GoalForecast(BaseSQLModel):
+    goal_id: int
+    remaining_amount: Decimal
+    daily_savings_rate: Decimal
+    projected_completion: date | None
+    days_to_deadline: int
+    required_daily_savings: Decimal
+    on_track: bool
@@ -0,0 +1,11 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class SearchHit(BaseModel, Generic[T]):
+    item: T
+    rank: float
+    highlight: str | None = None
@@ -1,9 +1,10 @@
 from datetime import datetime
 from decimal import Decimal
 
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
-from src.schemas.base import BaseSQLModel
+from src.schemas.base import BaseSQLModel, trigram_index
 from src.schemas.transactions import TransactionTagLink
 
 
@@ -13,6 +14,11 @@ class TagDefault(BaseSQLModel):
 
 
 class Tag(TagDefault, table=True):
+    __table_args__ = (
+        Index("ix_tag_user_id", "user_id"),
+        trigram_index("ix_tag_name_trgm", "name"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     user: "User" = Relationship(back_populates="tags")  # noqa: F821
 
@@ -1,13 +1,21 @@
-from datetime import datetime
+import re
+from datetime import datetime, timezone
 from decimal import Decimal
+from enum import Enum
 
+from pydantic import BaseModel, field_validator
+from sqlalchemy import DDL, Index, event
 from sqlmodel import Field, Relationship, SQLModel
 
-from src.schemas.base import BaseSQLModel
+from src.schemas.base import BaseSQLModel, trigram_index
 
 
 class TransactionTagLink(SQLModel, table=True):
     __tablename__ = "transaction_tag"
+    __table_args__ = (
+        Index("uq_transaction_tag_transaction_id_tag_id", "transaction_id", "tag_id", unique=True),
+        Index("ix_transaction_tag_tag_id", "tag_id"),
+    )
 
     id: int = Field(default=None, primary_key=True)
     transaction_id: int = Field(foreign_key="transaction.id")
@@ -23,6 +31,12 @@ class TransactionDefault(BaseSQLModel):
 
 
 class Transaction(TransactionDefault, table=True):
+    __table_args__ = (
+        Index("ix_transaction_user_id_date_id", "user_id", "date", "id"),
+        Index("ix_transaction_category_id", "category_id"),
+        trigram_index("ix_transaction_description_trgm", "description"),
+    )
+
     id: int = Field(default=None, primary_key=True)
 
     user: "User" = Relationship(back_populates="transactions")  # noqa: F821
@@ -34,10 +48,22 @@ class Transaction(TransactionDefault, table=True):
     )
 
 
+# `description_tsv` feeds full-text search in `src.search`; it lives outside the model since SQLite has no tsvector
+DESCRIPTION_TSV_DDL = (
+    "ALTER TABLE transaction ADD COLUMN IF NOT EXISTS description_tsv tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(description, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_transaction_description_tsv ON transaction USING gin (description_tsv)",
+)
+
+for statement in DESCRIPTION_TSV_DDL:
+    event.listen(Transaction.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+
 class TransactionUpdate(BaseSQLModel):
     amount: Decimal | None
     date: datetime | None
     description: str | None
+    tag_ids: list[int] | None = None
 
 
 class TransactionCreate(BaseSQLModel):
@@ -47,3 +73,43 @@ class TransactionCreate(BaseSQLModel):
     date: datetime
     description: str = None
     tag_ids: list[int] | None = []
+
+
+class FileFormat(Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+
+
+INVALID_TEXT = re.compile("[\x00\ud800-\udfff]")
+
+
+class TransactionImportRow(BaseModel):
+    category_id: int
+    amount: Decimal = Field(decimal_places=2, max_digits=10)
+    date: datetime
+    description: str | None = None
+    tag_ids: list[int] = []
+
+    @field_validator("date")
+    @classmethod
+    def drop_timezone(cls, date: datetime) -> datetime:
+        # `transaction.date` is stored without time zone, keep aware dates as naive UTC
+        return date.astimezone(timezone.utc).replace(tzinfo=None) if date.tzinfo else date
+
+    @field_validator("description")
+    @classmethod
+    def check_text(cls, description: str | None) -> str | None:
+        # bytes of the upload that are not UTF-8 arrive as lone surrogates, and PostgreSQL stores no NUL
+        if description is not None and INVALID_TEXT.search(description):
+            raise ValueError("must be UTF-8 text without NUL characters")
+        return description
+
+
+class ImportRowError(BaseModel):
+    row: int
+    detail: str
+
+
+class ImportResult(BaseModel):
+    imported: int
+    errors: list[ImportRowError]
@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship
 
 from src.schemas.base import BaseSQLModel
@@ -28,6 +29,8 @@ class UserDefault(BaseSQLModel):
 
 
 class User(UserDefault, table=True):
+    __table_args__ = (Index("uq_user_email", "email", unique=True),)
+
     id: int = Field(default=None, primary_key=True)
     created_at: datetime
 
@@ -38,6 +41,18 @@ class User(UserDefault, table=True):
     budgets: list["Budget"] = Relationship(back_populates="user")  # noqa: F821
 
 
+class UserPrincipal(BaseModel):
+    """The authenticated user, without credentials: it is cached across requests and workers, see `src.cache`."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    username: str
+    email: EmailStr
+    birth_date: datetime
+    created_at: datetime
+
+
 class UserUpdate(BaseSQLModel):
     username: str | None = None
     birth_date: datetime | None = None
@@ -0,0 +1,11 @@
+from sqlmodel import Field, SQLModel
+
+
+class CollectionVersion(SQLModel, table=True):
+    """Counter bumped on every write to a user's collection, the source of list ETags in `src.etag`."""
+
+    __tablename__ = "collection_version"
+
+    user_id: int = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    collection: str = Field(primary_key=True)
+    version: int = Field(default=0)
@@ -0,0 +1,125 @@
+import re
+
+from sqlalchemy import ColumnElement, Select, and_, func, literal, literal_column, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.schemas.categories import Category
+from src.schemas.goals import Goal
+from src.schemas.search import SearchHit
+from src.schemas.tags import Tag
+from src.schemas.transactions import Transaction
+
+# must match the configuration of the generated `transaction.description_tsv` column
+TEXT_SEARCH_CONFIG = "simple"
+search_config = literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig")
+
+HIGHLIGHT_START = "<b>"
+HIGHLIGHT_STOP = "</b>"
+HEADLINE_OPTIONS = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxFragments=2, MinWords=3, MaxWords=12"
+
+description_tsv = literal_column("transaction.description_tsv", TSVECTOR)
+
+Named = Category | Goal | Tag
+
+
+def terms(q: str) -> list[str]:
+    return re.findall(r"\w+", q.lower())
+
+
+def prefix_tsquery(words: list[str]) -> ColumnElement:
+    # every term is matched as a prefix: "cof bea" -> "cof:* & bea:*"; `terms` leaves no tsquery syntax behind
+    return func.to_tsquery(search_config, " & ".join(f"{word}:*" for word in words))
+
+
+def highlight(text: str | None, words: list[str]) -> str | None:
+    # python counterpart of `ts_headline` for names and for databases without full-text search
+    if not text:
+        return text
+    pattern = re.compile("|".join(re.escape(word) for word in words), re.IGNORECASE)
+    return pattern.sub(lambda match: f"{HIGHLIGHT_START}{match.group()}{HIGHLIGHT_STOP}", text)
+
+
+def is_postgres(session: AsyncSession) -> bool:
+    return session.bind.dialect.name == "postgresql"
+
+
+def transactions_search_query(dialect: str, words: list[str], user_id: int | None) -> Select:
+    if dialect == "postgresql":
+        tsquery = prefix_tsquery(words)
+        rank = func.ts_rank(description_tsv, tsquery)
+        statement = (
+            select(
+                Transaction,
+                rank.label("rank"),
+                func.ts_headline(search_config, Transaction.description, tsquery, HEADLINE_OPTIONS),
+            )
+            .where(description_tsv.op("@@")(tsquery))
+            .order_by(rank.desc(), Transaction.date.desc(), Transaction.id.desc())
+        )
+    else:
+        # unranked substring fallback, e.g. for SQLite-based test runs
+        statement = (
+            select(Transaction, literal(0.0).label("rank"), Transaction.description)
+            .where(and_(*(Transaction.description.icontains(word, autoescape=True) for word in words)))
+            .order_by(Transaction.date.desc(), Transaction.id.desc())
+        )
+
+    if user_id is not None:
+        statement = statement.where(Transaction.user_id == user_id)
+    return statement
+
+
+async def search_transactions(
+    session: AsyncSession,
+    q: str,
+    user_id: int | None,
+    limit: int,
+) -> list[SearchHit[Transaction]]:
+    words = terms(q)
+    if not words:
+        return []
+
+    statement = transactions_search_query(session.bind.dialect.name, words, user_id)
+    rows = (await session.execute(statement.limit(limit))).all()
+    if not is_postgres(session):
+        rows = [(transaction, rank, highlight(text, words)) for transaction, rank, text in rows]
+    return [SearchHit(item=transaction, rank=rank, highlight=headline) for transaction, rank, headline in rows]
+
+
+def names_search_query(dialect: str, model: type[Named], q: str, user_id: int | None) -> Select:
+    q = q.strip()
+    # both ILIKE and the `%` similarity operator are served by the trigram index on `name`,
+    # the latter also catches typos; prefix matches are ranked first
+    condition = model.name.icontains(q, autoescape=True)
+    if dialect == "postgresql":
+        rank = func.similarity(model.name, q)
+        condition = or_(condition, model.name.op("%")(q))
+    else:
+        rank = literal(0.0)
+
+    statement = (
+        select(model, rank.label("rank"))
+        .where(condition)
+        .order_by(model.name.istartswith(q, autoescape=True).desc(), rank.desc(), model.id)
+    )
+    if user_id is not None:
+        statement = statement.where(model.user_id == user_id)
+    return statement
+
+
+async def search_names(
+    session: AsyncSession,
+    model: type[Named],
+    q: str,
+    user_id: int | None,
+    limit: int,
+) -> list[SearchHit[Named]]:
+    words = terms(q)
+    if not words:
+        return []
+
+    statement = names_search_query(session.bind.dialect.name, model, q, user_id)
+    rows = (await session.execute(statement.limit(limit))).all()
+    return [SearchHit(item=item, rank=rank, highlight=highlight(item.name, words)) for item, rank in rows]
@@ -0,0 +1,30 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlmodel import SQLModel
+
+
+def default(value: Any) -> Any:
+    # orjson has no Decimal support; pydantic dumps it as a string too, so both paths emit the same JSON
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=default)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """JSON response rendered by orjson, for content that is already plain dicts, lists and scalars."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def model_columns(model: type[SQLModel]) -> tuple[InstrumentedAttribute, ...]:
+    # in field order, so the rows serialize with the same keys and order as the model itself
+    return tuple(getattr(model, name) for name in model.model_fields)
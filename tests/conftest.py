@@ -0,0 +1,22 @@
+import os
+
+import pytest
+
+# `src.config` reads its settings on import; the unit tests need none of these services
+for name, value in {
+    "DB_HOST": "localhost",
+    "DB_USER": "postgres",
+    "DB_PASSWORD": "postgres",
+    "DB_NAME": "finance",
+    "AUTH_SECRET": "test",
+    "PARSER_CELERY_BROKER_URL": "memory://",
+    "PARSER_CELERY_BACKEND_URL": "cache+memory://",
+    "PARSER_PARSER_URL": "http://localhost:8080",
+    "GRAPHQL_URL": "http://localhost:8090",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
@@ -0,0 +1,43 @@
+import fakeredis
+import pytest
+
+from src.cache import PrincipalCache
+
+pytestmark = pytest.mark.anyio
+
+PRINCIPAL = {"id": 1, "username": "a", "email": "a@b.co"}
+
+
+@pytest.fixture
+def workers() -> tuple[PrincipalCache, PrincipalCache]:
+    # two workers, each with its own client of the same Redis
+    server = fakeredis.FakeServer()
+    return tuple(PrincipalCache(maxsize=16, ttl=60, redis=fakeredis.FakeAsyncRedis(server=server)) for _ in range(2))
+
+
+async def test_entry_is_shared_across_workers(workers):
+    first, second = workers
+    await first.set("a@b.co", PRINCIPAL)
+
+    assert await second.get("a@b.co") == PRINCIPAL
+
+
+async def test_invalidation_is_seen_by_other_workers(workers):
+    first, second = workers
+    await first.set("a@b.co", PRINCIPAL)
+    assert await second.get("a@b.co") == PRINCIPAL
+
+    await first.invalidate("a@b.co")
+
+    assert await second.get("a@b.co") is None
+    assert await first.get("a@b.co") is None
+
+
+async def test_without_redis_entries_stay_in_process():
+    cache = PrincipalCache(maxsize=16, ttl=60)
+    await cache.set("a@b.co", PRINCIPAL)
+    assert await cache.get("a@b.co") == PRINCIPAL
+
+    await cache.invalidate("a@b.co")
+
+    assert await cache.get("a@b.co") is None